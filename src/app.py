@@ -1,12 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from newspaper import Article
-from newsdataapi import NewsDataApiClient
-from datetime import datetime
-
-from config.configuration import ConfigurationManager
-from components.data_ingestion import DataIngestion
 
 from pages import sentiment, news_extractor
 
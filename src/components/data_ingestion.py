@@ -1,45 +1,68 @@
 import os
 import pickle
-from dotenv import load_dotenv
+from dataclasses import replace
 
-from newspaper import Article
-from newsdataapi import NewsDataApiClient
+import requests
 
 from config_entity import DataIngestionConfig
+from components.news_scheduler import NewsFetchScheduler
+from components.news_archive import NewsArchive
+from components.text_cleaning import TextCleaner
+from utils.newsdata_standin import ReplayStandIn
 
 class DataIngestion:
     def __init__(self, config:DataIngestionConfig):
         self.config = config
         self.all_news_articles = None
+        self.cleaning_report = None
+        # "record" archives API responses and article HTML, "replay" serves them from a local stand-in
+        self.archive = None
+        if config.mode in ("record", "replay"):
+            self.archive = NewsArchive(config.archive_path, mode=config.mode)
     
-    def newsdata_connect(self):
-        load_dotenv
-        try:
-            api = NewsDataApiClient(apikey=os.getenv('NEWSDATA_API_TOKEN'))
-            print('connected to API')
-            return api
-        except Exception as e:
-            print("Not connected to API")
-            return None
-        
-
     def extract_news(self, query:list[str]=None, limit:int=5, country:str='in'):
-        api = self.newsdata_connect()
-        search_query = query or (self.config.query if self.config.query else 'finance')
-        # Combine queries into a single OR-separated string with quotes
-        combined_query = " OR ".join([f'"{q}"' for q in search_query])
-        print(combined_query)
+        """Fetch up to `limit` articles per query and scrape their full content"""
+        replay_server = None
+        config = self.config
+        if config.mode == "replay":
+            replay_server = ReplayStandIn(
+                self.archive,
+                latency=config.replay_latency,
+                error_rate=config.replay_error_rate,
+                seed=config.replay_seed
+            ).start()
+            config = replace(config, base_url=replay_server.base_url)
         try:
-            response = api.latest_api(
-                q=combined_query,
-                country=country,
-                category='business',
-                size=limit,
-                language='en'
-            )
-            articles = response.get('results',[])
-            print(articles)
-        except Exception as e:
+            return self._extract_news(config, query, limit, country, replay_server)
+        finally:
+            if replay_server is not None:
+                replay_server.stop()
+            if self.archive is not None and self.archive.recording:
+                self.archive.save()
+
+    def _download_article(self, url:str, replay_server=None):
+        # newspaper (lxml, nltk) is only loaded once something is actually scraped
+        from newspaper import Article
+        news_article = Article(url)
+        if replay_server is not None:
+            response = requests.get(replay_server.html_url(url), timeout=self.config.timeout)
+            response.raise_for_status()
+            news_article.download(input_html=response.text)
+        else:
+            news_article.download()
+            if self.archive is not None and self.archive.recording:
+                self.archive.add_html(url, news_article.html)
+        news_article.parse()
+        return news_article
+
+    def _extract_news(self, config, query, limit, country, replay_server):
+        search_query = query or (config.query if config.query else ['finance'])
+        if isinstance(search_query, str):
+            search_query = [search_query]
+        # step 1: one paginated, rate-limited request stream per query
+        scheduler = NewsFetchScheduler(config, archive=self.archive)
+        articles = scheduler.fetch(search_query, limit=limit, country=country)
+        if not articles:
             print("No articles returned")
             return []
 
@@ -53,9 +76,7 @@ class DataIngestion:
                     print("Skipping: No url")
                     continue
                 # get full content
-                news_article = Article(url)
-                news_article.download()
-                news_article.parse()
+                news_article = self._download_article(url, replay_server)
                 full_articles.append({
                     'article_id': article['article_id'],
                     'title': article['title'],
@@ -66,10 +87,20 @@ class DataIngestion:
                     'category': article['category'],
                     'full_content': news_article.text,
                     'authors': ', '.join(news_article.authors),
-                    'image_url': article['image_url']
+                    'image_url': article['image_url'],
+                    'search_query': article.get('search_query')
                 })
             except Exception as e:
                 print(f"Error scraping {article['link']}: {e}")
+
+        # step 3: strip boilerplate so it doesn't eat into the model's token window
+        if config.clean_text:
+            cleaner = TextCleaner(config.boilerplate_patterns)
+            for article in full_articles:
+                cleaner.clean_article(article)
+            self.cleaning_report = cleaner.report()
+            print(f"Cleaning removed {self.cleaning_report['tokens_saved']} tokens "
+                  f"({self.cleaning_report['tokens_saved_pct']:.1f}%) across {len(full_articles)} articles")
         self.all_news_articles = full_articles
         return self.all_news_articles
 
@@ -1,17 +1,62 @@
 import mysql.connector
 from mysql.connector import Error, pooling
-import pandas as pd
+from mysql.connector.errors import PoolError
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
+import threading
+import time
 from pathlib import Path
 
 from config_entity import DatabaseConfig
 logger = logging.getLogger(__name__)
+
+ROWS_PER_STATEMENT = 100        # rows bound per execution of a prepared multi-row INSERT
+
+# (INSERT head, values per row, tail) for the prepared write path
+# a duplicate article is a no-op update (0 affected rows), unlike INSERT IGNORE it
+# does not also swallow truncation and conversion errors in the other columns
+ARTICLES_INSERT = (
+    """INSERT INTO news_articles
+    (article_id, title, description, content, source, published_date,
+    url, category, country, language)""",
+    10,
+    "ON DUPLICATE KEY UPDATE article_id = article_id"
+)
+SENTIMENT_INSERT = (
+    """INSERT INTO sentiment_analysis
+    (article_id, model_name, sentiment, confidence,
+    positive_score, negative_score, neutral_score,
+    processing_time_ms)""",
+    8,
+    """ON DUPLICATE KEY UPDATE
+    sentiment = VALUES(sentiment),
+    confidence = VALUES(confidence),
+    positive_score = VALUES(positive_score),
+    negative_score = VALUES(negative_score),
+    neutral_score = VALUES(neutral_score),
+    processing_time_ms = VALUES(processing_time_ms)"""
+)
+TICKERS_INSERT = (
+    """INSERT INTO article_tickers
+    (article_id, symbol, exchange, mention_count, in_title)""",
+    5,
+    """ON DUPLICATE KEY UPDATE
+    mention_count = VALUES(mention_count),
+    in_title = VALUES(in_title)"""
+)
+
 class Database:
     def __init__(self, config=DatabaseConfig):
         self.config = config
         self.connection_pool = None
+        self._metrics_lock = threading.Lock()
+        self._prepared = {}             # connection_id -> {(INSERT head, rows): (cursor, query)}
+        self._checked_out = 0           # connections handed out by get_connection and not yet released
+        self.metrics = {
+            'acquired': 0, 'wait_s_total': 0.0, 'wait_s_max': 0.0, 'peak_in_use': 0,
+            'exhausted': 0, 'timeouts': 0, 'connection_errors': 0, 'write_errors': 0, 'last_error': None
+        }
         
         if config.enabled:
             self._create_connection_pool()
@@ -20,7 +65,9 @@ class Database:
         self.connection_pool = mysql.connector.pooling.MySQLConnectionPool(
             pool_name="finews_pool",
             pool_size=self.config.pool_size,
-            pool_reset_session=True,
+            # Database never changes session state, and a reset would drop the
+            # prepared statements cached per connection
+            pool_reset_session=False,
             host=self.config.host,
             port=self.config.port,
             database=self.config.database,
@@ -31,56 +78,255 @@ class Database:
         logger.info("MySQL connection pool created")
 
     def get_connection(self):
+        """Pooled connection, waiting up to pool_timeout seconds when every connection is in use"""
         if not self.config.enabled or not self.connection_pool:
             return None
+        start = time.perf_counter()
+        delay = 0.005
+        exhausted = False
+        while True:
+            try:
+                connection = self.connection_pool.get_connection()
+                break
+            except PoolError as e:
+                if not exhausted:
+                    exhausted = True
+                    self._record('exhausted')
+                if time.perf_counter() - start >= self.config.pool_timeout:
+                    logger.error(f"Error getting connection: {e} (waited {self.config.pool_timeout}s)")
+                    self._record('timeouts', error=e)
+                    return None
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+            except Error as e:
+                logger.error(f"Error getting connection: {e}")
+                self._record('connection_errors', error=e)
+                return None
+
+        waited = time.perf_counter() - start
+        with self._metrics_lock:
+            self._checked_out += 1
+            self.metrics['acquired'] += 1
+            self.metrics['wait_s_total'] += waited
+            self.metrics['wait_s_max'] = max(self.metrics['wait_s_max'], waited)
+            self.metrics['peak_in_use'] = max(self.metrics['peak_in_use'], self._checked_out)
+        return connection
+
+    def release_connection(self, connection):
+        """Return a connection from get_connection to the pool"""
         try:
-            return self.connection_pool.get_connection()
+            connection.close()
         except Error as e:
-            logger.error(f"Error getting connection: {e}")
+            logger.error(f"Error returning connection to pool: {e}")
+        finally:
+            with self._metrics_lock:
+                self._checked_out -= 1
+
+    def _record(self, key: str, error: Exception = None):
+        with self._metrics_lock:
+            self.metrics[key] += 1
+            if error is not None:
+                self.metrics['last_error'] = str(error)
+
+    def pool_metrics(self) -> Dict:
+        """Connections in use, acquisition wait times, exhaustion events and write failures"""
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        acquired = metrics.pop('acquired')
+        wait_s_total = metrics.pop('wait_s_total')
+        wait_s_max = metrics.pop('wait_s_max')
+        pool_size = self.connection_pool.pool_size if self.connection_pool else 0
+        with self._metrics_lock:
+            in_use = self._checked_out
+        return {
+            'pool_size': pool_size,
+            'in_use': in_use,
+            'idle': pool_size - in_use,
+            'acquired': acquired,
+            'wait_ms_avg': 1000 * wait_s_total / acquired if acquired else 0.0,
+            'wait_ms_max': 1000 * wait_s_max,
+            **metrics
+        }
+
+    def _prepared_cursors(self, connection) -> Dict:
+        """Prepared cursors of this pooled connection, kept across batches so each INSERT shape is prepared once"""
+        with self._metrics_lock:
+            return self._prepared.setdefault(connection.connection_id, {})
+
+    def _discard_prepared(self, connection_id):
+        with self._metrics_lock:
+            cursors = self._prepared.pop(connection_id, {})
+        for cursor, _ in cursors.values():
+            try:
+                cursor.close()
+            except Error:
+                pass
+
+    @staticmethod
+    def _insert_rows(connection, cursors, statement, rows) -> int:
+        """Execute a multi-row INSERT through prepared statements, ROWS_PER_STATEMENT rows at a time
+
+        One prepared cursor is kept per statement and row count, so a
+        connection prepares each shape (full chunks and each remainder) once.
+        """
+        head, width, tail = statement
+        affected = 0
+        for start in range(0, len(rows), ROWS_PER_STATEMENT):
+            chunk = rows[start:start + ROWS_PER_STATEMENT]
+            key = (head, len(chunk))
+            if key not in cursors:
+                values = ", ".join(["(" + ", ".join(["%s"] * width) + ")"] * len(chunk))
+                cursors[key] = (connection.cursor(prepared=True), f"{head} VALUES {values} {tail}")
+            # the prepared cursor only skips re-preparing when given the same query object
+            cursor, query = cursors[key]
+            cursor.execute(query, [value for row in chunk for value in row])
+            affected += cursor.rowcount
+        return affected
+
+    def _write(self, writes: List[Tuple[tuple, List[tuple]]]) -> Optional[List[int]]:
+        """Run (statement, rows) writes in order in one transaction, affected rows per write or None on error"""
+        connection = self.get_connection()
+        if not connection:
             return None
-        
-    # ========== Article Operations ========== #
 
-    def insert_articles_batch(self, articles:List[Dict]) ->bool:
+        connection_id = connection.connection_id
+        try:
+            cursors = self._prepared_cursors(connection)
+            # sessions are not reset on return to the pool, so a read may have left a transaction open
+            if connection.in_transaction:
+                connection.rollback()
+            connection.start_transaction()
+            affected = [self._insert_rows(connection, cursors, statement, rows) for statement, rows in writes]
+            connection.commit()
+            return affected
+
+        except Error as e:
+            logger.error(f"Batch write error: {e}")
+            self._record('write_errors', error=e)
+            # the connection may have been reset or reconnected, prepare again next time
+            self._discard_prepared(connection_id)
+            try:
+                connection.rollback()
+            except Error:
+                pass
+            return None
+        finally:
+            self.release_connection(connection)
+
+    @staticmethod
+    def _first(value):
+        """NewsData returns category/country as lists"""
+        if isinstance(value, (list, tuple)):
+            return value[0] if value else None
+        return value
+
+    def _article_row(self, article: Dict) -> tuple:
+        return (
+            article.get('article_id'),
+            article.get('title'),
+            article.get('description') or '',
+            article.get('content') or article.get('full_content') or '',
+            article.get('source') or article.get('source_name') or 'Unknown',
+            article.get('published_date') or article.get('pubDate'),
+            article.get('url') or article.get('link') or '',
+            self._first(article.get('category')) or 'business',
+            self._first(article.get('country')) or 'IN',
+            article.get('language') or 'en'
+        )
+
+    @staticmethod
+    def _sentiment_row(sentiment: Dict) -> tuple:
+        return (
+            sentiment.get('article_id'),
+            sentiment.get('model_name'),
+            sentiment.get('sentiment'),
+            sentiment.get('confidence'),
+            sentiment.get('positive_score', 0.0),
+            sentiment.get('negative_score', 0.0),
+            sentiment.get('neutral_score', 0.0),
+            sentiment.get('processing_time_ms', 0.0)
+        )
+
+    @staticmethod
+    def _ticker_row(tag: Dict) -> tuple:
+        return (
+            tag.get('article_id'),
+            tag.get('symbol'),
+            tag.get('exchange', 'NSE'),
+            tag.get('mention_count', 1),
+            tag.get('in_title', False)
+        )
+
+    def write_batch(self, articles: List[Dict], sentiments: List[Dict] = None,
+                    tags: List[Dict] = None) -> Optional[Tuple[int, int]]:
+        """Write articles, then their ticker tags and sentiment rows, in one transaction
+
+        Tags and sentiment rows reference news_articles, so they are written
+        after it, and any error rolls the whole batch back. Returns
+        (inserted, failed) for the articles: failed counts duplicates and
+        articles missing an id, title or published date. Returns None when
+        the transaction failed and nothing was written.
+        """
         if not self.config.enabled:
             return (0, len(articles))
-        
+
+        rows = [self._article_row(article) for article in articles]
+        valid = [row for row in rows if row[0] and row[1] and row[5]]
+        skipped = {row[0] for row in rows} - {row[0] for row in valid}
+        writes = [(ARTICLES_INSERT, valid)]
+        if tags:
+            writes.append((TICKERS_INSERT, [self._ticker_row(tag) for tag in tags
+                                            if tag.get('article_id') not in skipped]))
+        if sentiments:
+            writes.append((SENTIMENT_INSERT, [self._sentiment_row(sentiment) for sentiment in sentiments
+                                              if sentiment.get('article_id') not in skipped]))
+
+        affected = self._write(writes)
+        if affected is None:
+            return None
+        successful = affected[0]
+        failed = len(articles) - successful
+        logger.info(f"Batch insert: {successful} success, {failed} failed"
+                    + (f", {affected[1]} ticker tags" if tags else "")
+                    + (f", {affected[-1]} sentiment rows" if sentiments else ""))
+        return (successful, failed)
+
+    # ========== Article Operations ========== #
+
+    def insert_articles_batch(self, articles: List[Dict]) -> Tuple[int, int]:
+        """Insert articles, returns (inserted, failed); duplicates count as failed"""
+        return self.write_batch(articles) or (0, len(articles))
+
+    def get_stored_article_ids(self, article_ids: List[str]) -> Optional[set]:
+        """The subset of article_ids present in news_articles, None on error"""
+        if not self.config.enabled:
+            return None
+
         connection = self.get_connection()
         if not connection:
-            return (0, len(articles))
-        
-        successful = 0
-        failed = 0
+            return None
 
         cursor = connection.cursor()
-        query = """
-                INSERT INTO news_articles 
-                (article_id, title, description, content, source, published_date,
-                url, category, country, language)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-        for article in articles:
-                try:
-                    data = (
-                        article.get('article_id'),
-                        article.get('title'),
-                        article.get('description', ''),
-                        article.get('content', ''),
-                        article.get('source', 'Unknown'),
-                        article.get('published_date'),
-                        article.get('url', ''),
-                        article.get('category', 'business'),
-                        article.get('country', 'IN'),
-                        article.get('language', 'en')
-                    )
-                    cursor.execute(query, data)
-                    successful += 1
-                except mysql.connector.IntegrityError:
-                    failed += 1
-        connection.commit()
-        logger.info(f"Batch insert: {successful} success, {failed} failed")
-        cursor.close()
-        connection.close()  
+        try:
+            ids = list({article_id for article_id in article_ids if article_id})
+            stored = set()
+            for start in range(0, len(ids), 1000):
+                chunk = ids[start:start + 1000]
+                cursor.execute(
+                    f"SELECT article_id FROM news_articles WHERE article_id IN ({', '.join(['%s'] * len(chunk))})",
+                    chunk
+                )
+                stored.update(row[0] for row in cursor.fetchall())
+            # sessions are not reset on return to the pool, so end the read transaction here
+            connection.rollback()
+            return stored
+
+        except Error as e:
+            logger.error(f"Get stored article ids error: {e}")
+            return None
+        finally:
+            cursor.close()
+            self.release_connection(connection)
 
     # ========== SENTIMENT OPERATIONS ==========
     
@@ -132,4 +378,64 @@ class Database:
             return False
         finally:
             cursor.close()
-            connection.close()
\ No newline at end of file
+            self.release_connection(connection)
+
+    def insert_sentiment_batch(self, sentiments: List[Dict]) -> bool:
+        """Insert many sentiment rows (e.g. SentimentResults.to_db_rows) in one transaction"""
+        if not self.config.enabled or not sentiments:
+            return False
+        affected = self._write([(SENTIMENT_INSERT, [self._sentiment_row(sentiment) for sentiment in sentiments])])
+        if affected is None:
+            return False
+        logger.info(f"Inserted {len(sentiments)} sentiment rows")
+        return True
+
+    # ========== TICKER OPERATIONS ==========
+
+    def insert_article_tickers(self, tags: List[Dict]) -> bool:
+        """Insert ticker tags produced by TickerTagger"""
+        if not self.config.enabled or not tags:
+            return False
+        affected = self._write([(TICKERS_INSERT, [self._ticker_row(tag) for tag in tags])])
+        if affected is None:
+            return False
+        logger.info(f"Inserted {len(tags)} article ticker tags")
+        return True
+
+    def get_ticker_sentiment(self, model_name: str, days: int = 7):
+        """Sentiment aggregated per ticker over the last `days`, via the article_tickers join"""
+        import pandas as pd
+        if not self.config.enabled:
+            return pd.DataFrame()
+
+        connection = self.get_connection()
+        if not connection:
+            return pd.DataFrame()
+
+        try:
+            cursor = connection.cursor(dictionary=True)
+
+            query = """
+                SELECT t.symbol,
+                    COUNT(*) AS articles,
+                    SUM(t.mention_count) AS mentions,
+                    AVG(s.positive_score - s.negative_score) AS net_sentiment,
+                    AVG(s.confidence) AS avg_confidence
+                FROM article_tickers t
+                JOIN sentiment_analysis s ON s.article_id = t.article_id
+                JOIN news_articles a ON a.article_id = t.article_id
+                WHERE s.model_name = %s
+                AND a.published_date >= %s
+                GROUP BY t.symbol
+                ORDER BY net_sentiment DESC
+            """
+
+            cursor.execute(query, (model_name, datetime.now() - timedelta(days=days)))
+            return pd.DataFrame(cursor.fetchall())
+
+        except Error as e:
+            logger.error(f"Get ticker sentiment error: {e}")
+            return pd.DataFrame()
+        finally:
+            cursor.close()
+            self.release_connection(connection)
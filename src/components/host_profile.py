@@ -0,0 +1,63 @@
+import json
+import os
+import platform
+import re
+import socket
+from typing import Dict, Optional
+
+from config_entity import SentimentAnalysisConfig
+
+
+def host_key() -> str:
+    """Identifies the machine a profile was tuned on (hostname + CPU count)"""
+    return f"{socket.gethostname()}-{os.cpu_count()}cpu"
+
+
+def profile_path(config: SentimentAnalysisConfig) -> str:
+    """One profile per host and model, so tuning another model never replaces this one's"""
+    model = re.sub(r'[^\w.-]+', '_', config.model_name).strip('_')
+    return os.path.join(config.host_profile_dir, f"{host_key()}-{model}.json")
+
+
+def load_host_profile(config: SentimentAnalysisConfig) -> Optional[Dict]:
+    """This host's tuned settings, None when there are none for the configured model and max_length"""
+    if config is None or not config.use_host_profile:
+        return None
+    path = profile_path(config)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        profile = json.load(f)
+    # a batch size tuned for another model or sequence length is not a safe default
+    for key in ('model_name', 'max_length'):
+        if profile.get(key) != getattr(config, key):
+            print(f"Ignoring host profile {path}: tuned for {key}={profile.get(key)}, "
+                  f"configured {key}={getattr(config, key)}")
+            return None
+    return profile
+
+
+def save_host_profile(config: SentimentAnalysisConfig, profile: Dict) -> str:
+    os.makedirs(config.host_profile_dir, exist_ok=True)
+    path = profile_path(config)
+    profile = {
+        'host': host_key(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        **profile
+    }
+    with open(path, 'w') as f:
+        json.dump(profile, f, indent=2)
+    return path
+
+
+def apply_thread_settings(num_threads: Optional[int], interop_threads: Optional[int]):
+    """Set torch intra-/inter-op threads; interop can only be set before any parallel work"""
+    import torch
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    if interop_threads and torch.get_num_interop_threads() != interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            print(f"Could not set interop threads to {interop_threads}: torch already started parallel work")
@@ -0,0 +1,245 @@
+import gc
+import hashlib
+import json
+import os
+import pickle
+import re
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from config_entity import ModelRegistryConfig, ScoringModelConfig
+from components.sentiment_results import SentimentResults
+
+LABELS = ("positive", "negative", "neutral")
+
+
+class ModelRegistry:
+    """Scores the same article batch with several sentiment classifiers
+
+    Models that share a tokenizer (same class, vocabulary and casing) and
+    max_length share one tokenization pass; batches are formed from
+    length-sorted encodings so padding stays small. At most
+    max_loaded_models models are held in memory, least recently used ones are
+    unloaded first. Every model's scores are mapped onto LABELS order, so
+    results can be compared and written side by side.
+    """
+
+    def __init__(self, config: ModelRegistryConfig):
+        self.config = config
+        self.models = OrderedDict((spec.key, spec) for spec in config.models)
+        self.tokenizers = {}                # tokenizer signature -> tokenizer
+        self.tokenizer_of = {}              # model key -> tokenizer signature
+        self.loaded = OrderedDict()         # model key -> (model, label order), least recently used first
+        self.model_loads = 0
+        self.results = {}
+        self.timings = {}
+        self.report = None
+
+    def register(self, spec: ScoringModelConfig):
+        self.models[spec.key] = spec
+
+    @staticmethod
+    def _tokenizer_signature(tokenizer) -> str:
+        """Tokenizers with equal signatures produce identical input ids"""
+        digest = hashlib.sha1(type(tokenizer).__name__.encode())
+        digest.update(str(tokenizer.init_kwargs.get('do_lower_case')).encode())
+        digest.update(json.dumps(sorted(tokenizer.get_vocab().items())).encode())
+        return digest.hexdigest()[:12]
+
+    def get_tokenizer(self, spec: ScoringModelConfig):
+        if spec.key not in self.tokenizer_of:
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(spec.model_name)
+            signature = self._tokenizer_signature(tokenizer)
+            self.tokenizers.setdefault(signature, tokenizer)
+            self.tokenizer_of[spec.key] = signature
+        signature = self.tokenizer_of[spec.key]
+        return signature, self.tokenizers[signature]
+
+    @staticmethod
+    def _label_order(spec: ScoringModelConfig, model) -> np.ndarray:
+        """Column of the model output holding each of LABELS"""
+        names = spec.labels or [model.config.id2label[i] for i in range(model.config.num_labels)]
+        names = [str(name).lower() for name in names]
+        missing = [label for label in LABELS if label not in names]
+        if missing:
+            raise ValueError(
+                f"Model '{spec.key}' outputs {names}, missing {missing}; "
+                f"set its labels in the model_registry config"
+            )
+        return np.array([names.index(label) for label in LABELS])
+
+    def get_model(self, spec: ScoringModelConfig):
+        """Loaded model and its label order, evicting the least recently used model if over the limit"""
+        if spec.key in self.loaded:
+            self.loaded.move_to_end(spec.key)
+            return self.loaded[spec.key]
+        while self.loaded and len(self.loaded) >= max(1, self.config.max_loaded_models):
+            self.unload(next(iter(self.loaded)))
+
+        from transformers import AutoModelForSequenceClassification
+        print(f"Loading {spec.key} ({spec.model_name})")
+        model = AutoModelForSequenceClassification.from_pretrained(spec.model_name)
+        model.eval()
+        self.loaded[spec.key] = (model, self._label_order(spec, model))
+        self.model_loads += 1
+        return self.loaded[spec.key]
+
+    def unload(self, key: Optional[str] = None):
+        """Unload one model, or every model when key is None"""
+        for evicted in ([key] if key else list(self.loaded)):
+            if self.loaded.pop(evicted, None) is not None:
+                print(f"Unloading {evicted}")
+        gc.collect()
+
+    @staticmethod
+    def _encode(tokenizer, texts: List[str], max_length: int):
+        """Truncated, unpadded encodings and the row order that sorts them by length"""
+        encodings = tokenizer(texts, truncation=True, max_length=max_length)
+        order = np.argsort([len(ids) for ids in encodings["input_ids"]], kind="stable")
+        return encodings, order
+
+    @staticmethod
+    def _run(model, tokenizer, encodings, order: np.ndarray, batch_size: int) -> np.ndarray:
+        import torch
+        scores = np.empty((len(order), model.config.num_labels), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            batch = tokenizer.pad(
+                {key: [values[i] for i in rows] for key, values in encodings.items()},
+                return_tensors="pt"
+            )
+            with torch.no_grad():
+                logits = model(**batch).logits
+            scores[rows] = torch.nn.functional.softmax(logits, dim=-1).numpy()
+        return scores
+
+    def score(self, news_list: List[Dict], model_keys: List[str] = None) -> Dict[str, SentimentResults]:
+        """Score news_list with every registered model (or model_keys), returns results per model key"""
+        specs = [self.models[key] for key in (model_keys or self.models)]
+        texts = [news.get('full_content') or '' for news in news_list]
+        article_ids = [news.get('article_id') for news in news_list]
+
+        groups = OrderedDict()
+        for spec in specs:
+            signature, _ = self.get_tokenizer(spec)
+            groups.setdefault((signature, spec.max_length), []).append(spec)
+        # models already in memory go first, so a run doesn't evict a model it still needs
+        for group in groups.values():
+            group.sort(key=lambda spec: spec.key not in self.loaded)
+        ordered_groups = sorted(groups.items(), key=lambda item: item[1][0].key not in self.loaded)
+
+        self.results = {}
+        self.timings = {'tokenization': []}
+        loads_before = self.model_loads
+        for (signature, max_length), group in ordered_groups:
+            tokenizer = self.tokenizers[signature]
+            start = time.time()
+            encodings, order = self._encode(tokenizer, texts, max_length)
+            self.timings['tokenization'].append({
+                'tokenizer': signature,
+                'max_length': max_length,
+                'models': [spec.key for spec in group],
+                'seconds': time.time() - start
+            })
+            for spec in group:
+                start = time.time()
+                model, label_order = self.get_model(spec)
+                loaded = time.time()
+                scores = self._run(model, tokenizer, encodings, order, spec.batch_size)
+                # drop the local reference, or evicting this model for the next one would not free it
+                del model
+                self.timings[spec.key] = {'load_s': loaded - start, 'score_s': time.time() - loaded}
+                self.results[spec.key] = SentimentResults(
+                    article_ids, scores[:, label_order], LABELS, articles=news_list
+                )
+        self.timings['model_loads'] = self.model_loads - loads_before
+        self.report = self.compare()
+        return self.results
+
+    def compare(self) -> Dict:
+        """Label distribution, confidence and speed per model, plus pairwise agreement"""
+        keys = list(self.results)
+        report = {
+            'articles': len(self.results[keys[0]]) if keys else 0,
+            'model_loads': self.timings.get('model_loads', 0),
+            'tokenization': self.timings.get('tokenization', []),
+            'models': {},
+            'agreement': {}
+        }
+        for key in keys:
+            results = self.results[key]
+            counts = np.bincount(results.label, minlength=len(LABELS))
+            score_s = self.timings[key]['score_s']
+            report['models'][key] = {
+                'model_name': self.models[key].model_name,
+                'distribution': {label: int(count) for label, count in zip(LABELS, counts)},
+                'mean_confidence': float(results.confidence.mean()) if len(results) else 0.0,
+                'load_s': self.timings[key]['load_s'],
+                'score_s': score_s,
+                'texts_per_s': len(results) / score_s if score_s else 0.0
+            }
+            report['agreement'][key] = {
+                other: float((results.label == self.results[other].label).mean()) if len(results) else 0.0
+                for other in keys if other != key
+            }
+        return report
+
+    def print_report(self):
+        report = self.report
+        print(f"Scored {report['articles']} articles with {len(report['models'])} models "
+              f"({report['model_loads']} loads, {len(report['tokenization'])} tokenization passes)")
+        for key, stats in report['models'].items():
+            distribution = ", ".join(f"{label} {count}" for label, count in stats['distribution'].items())
+            print(f"  {key:<24} {stats['texts_per_s']:8.1f} texts/s  "
+                  f"confidence {stats['mean_confidence']:.2f}  {distribution}")
+        for key, others in report['agreement'].items():
+            for other, rate in others.items():
+                if key < other:
+                    print(f"  {key} vs {other}: {rate:.1%} agreement")
+
+    @staticmethod
+    def _filename(key: str) -> str:
+        return 'news_sentiment_' + re.sub(r'[^\w.-]+', '_', key) + '.pkl'
+
+    def save_results(self):
+        """One news_sentiment_<model>.pkl per model plus model_comparison.json"""
+        for key, results in self.results.items():
+            with open(os.path.join(self.config.root_dir, self._filename(key)), 'wb') as f:
+                pickle.dump(results, f)
+        with open(os.path.join(self.config.root_dir, 'model_comparison.json'), 'w') as f:
+            json.dump(self.report, f, indent=2)
+
+    def load_results(self, key: str) -> SentimentResults:
+        with open(os.path.join(self.config.root_dir, self._filename(key)), 'rb') as f:
+            return pickle.load(f)
+
+    def store_results(self, db) -> Dict[str, bool]:
+        """Write each model's results to sentiment_analysis under the model's name
+
+        Rows carry the model_name (e.g. "ProsusAI/finbert"), not the registry
+        key, so they group with rows FinBERTSentimentAnalyzer writes for the
+        same model. Only rows of articles already in news_articles are written
+        (the rest would fail the foreign key and roll back the whole batch);
+        returns whether each model's rows were written.
+        """
+        article_ids = [article_id for results in self.results.values() for article_id in results.article_ids]
+        stored_ids = db.get_stored_article_ids(article_ids)
+        if stored_ids is None:
+            print("Could not read stored article ids, no model results written to the database")
+            return {key: False for key in self.results}
+
+        stored = {}
+        for key, results in self.results.items():
+            per_article_ms = 1000 * self.timings[key]['score_s'] / len(results) if len(results) else 0.0
+            rows = [row for row in results.to_db_rows(self.models[key].model_name, per_article_ms)
+                    if row['article_id'] in stored_ids]
+            if len(rows) < len(results):
+                print(f"{key}: skipped {len(results) - len(rows)} results of articles not in news_articles")
+            stored[key] = db.insert_sentiment_batch(rows) if rows else True
+            if not stored[key]:
+                print(f"{key}: failed to write {len(rows)} sentiment rows")
+        return stored
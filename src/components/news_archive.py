@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import threading
+import zipfile
+from typing import Dict, Optional
+
+
+class NewsArchive:
+    """Compact on-disk archive of NewsData responses and raw article HTML
+
+    A single deflate-compressed zip: `index.json` maps request keys to
+    members, `api/<hash>.json` holds one /latest response and
+    `html/<hash>.html` one article page. In "record" mode entries are kept
+    in memory and written by save(); in "replay" mode members are read
+    lazily, so large archives are not loaded up front.
+    """
+
+    def __init__(self, path: str, mode: str = "replay"):
+        self.path = path
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.index = {'api': {}, 'html': {}}
+        self.pending = {}
+        self._zip = None
+
+        if os.path.exists(path):
+            self._zip = zipfile.ZipFile(path, 'r')
+            self.index = json.loads(self._zip.read('index.json'))
+        elif mode == "replay":
+            raise FileNotFoundError(f"No news archive at {path}; run ingestion in record mode first")
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @staticmethod
+    def request_key(params: Dict) -> str:
+        """Canonical key for a /latest request; the API key never enters the archive"""
+        canonical = {key: str(value) for key, value in params.items() if key != 'apikey' and value is not None}
+        return json.dumps(canonical, sort_keys=True)
+
+    @staticmethod
+    def _member(kind: str, key: str) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return f"{kind}/{digest}.{'json' if kind == 'api' else 'html'}"
+
+    def _add(self, kind: str, key: str, data: bytes):
+        member = self._member(kind, key)
+        with self.lock:
+            self.index[kind][key] = member
+            self.pending[member] = data
+
+    def _get(self, kind: str, key: str) -> Optional[bytes]:
+        member = self.index[kind].get(key)
+        if member is None:
+            return None
+        with self.lock:
+            if member in self.pending:
+                return self.pending[member]
+            return self._zip.read(member)
+
+    def add_response(self, params: Dict, response: Dict):
+        self._add('api', self.request_key(params), json.dumps(response).encode('utf-8'))
+
+    def get_response(self, params: Dict) -> Optional[Dict]:
+        data = self._get('api', self.request_key(params))
+        return json.loads(data) if data is not None else None
+
+    def add_html(self, url: str, html: str):
+        if html:
+            self._add('html', url, html.encode('utf-8'))
+
+    def get_html(self, url: str) -> Optional[str]:
+        data = self._get('html', url)
+        return data.decode('utf-8') if data is not None else None
+
+    def save(self):
+        """Rewrite the archive with previously recorded and pending entries"""
+        if not self.pending:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with self.lock, zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as out:
+            if self._zip is not None:
+                for member in self._zip.namelist():
+                    if member != 'index.json' and member not in self.pending:
+                        out.writestr(member, self._zip.read(member))
+                self._zip.close()
+            for member, data in self.pending.items():
+                out.writestr(member, data)
+            out.writestr('index.json', json.dumps(self.index))
+        os.replace(tmp_path, self.path)
+        self._zip = zipfile.ZipFile(self.path, 'r')
+        print(f"Archived {len(self.index['api'])} API responses and "
+              f"{len(self.index['html'])} article pages to {self.path}")
+        self.pending = {}
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional
+
+import requests
+
+from config_entity import DataIngestionConfig, load_env
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def drain(self, seconds: float):
+        """Server said we are over the limit: stop everyone for `seconds`"""
+        with self.lock:
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class NewsFetchScheduler:
+    """Per-query NewsData /latest fetches in parallel, with pagination and rate limiting
+
+    Every request (one page) costs one API credit. Requests from all worker
+    threads share one token bucket, so parallelism never exceeds the rate
+    limit, and the run stops issuing requests once `max_credits` is spent.
+    """
+
+    def __init__(self, config: DataIngestionConfig, archive=None):
+        self.config = config
+        self.archive = archive
+        load_env()
+        self.api_key = os.getenv('NEWSDATA_API_TOKEN')
+        self.bucket = TokenBucket(config.requests_per_second, config.burst)
+        self.session = requests.Session()
+        self.credits_lock = threading.Lock()
+        self.credits_used = 0
+        self.stats = {}
+
+    def _take_credit(self) -> bool:
+        with self.credits_lock:
+            if self.credits_used >= self.config.max_credits:
+                return False
+            self.credits_used += 1
+            return True
+
+    def _request_page(self, params: Dict) -> Optional[Dict]:
+        url = self.config.base_url.rstrip('/') + '/latest'
+        for attempt in range(self.config.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=self.config.timeout)
+            except requests.RequestException as e:
+                print(f"Request error for '{params.get('q')}': {e}")
+                self._count('errors')
+                time.sleep(2 ** attempt * 0.5)
+                continue
+            self._count('requests')
+            if response.status_code == 429:
+                self._count('rate_limited')
+                self.bucket.drain(self._retry_after(response.headers.get('Retry-After'), attempt))
+                continue
+            if response.status_code >= 500:
+                self._count('errors')
+                time.sleep(2 ** attempt * 0.5)
+                continue
+            if response.status_code != 200:
+                print(f"NewsData returned {response.status_code} for '{params.get('q')}': {response.text[:200]}")
+                return None
+            return response.json()
+        return None
+
+    @staticmethod
+    def _retry_after(value: Optional[str], attempt: int) -> float:
+        """Seconds to wait from a Retry-After header (delay-seconds or HTTP-date), else exponential backoff"""
+        backoff = float(2 ** attempt)
+        if not value:
+            return backoff
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return backoff
+
+    def _count(self, key: str, n: int = 1):
+        with self.credits_lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def fetch_query(self, query: str, limit: int, country: str) -> List[Dict]:
+        """Follow nextPage for one query until `limit` articles or the results run out"""
+        articles = []
+        page = None
+        while len(articles) < limit:
+            if not self._take_credit():
+                print(f"Credit budget exhausted while fetching '{query}'")
+                break
+            params = {
+                'apikey': self.api_key,
+                'q': query,
+                'country': country,
+                'category': 'business',
+                'language': 'en',
+                'size': min(self.config.page_size, limit - len(articles)),
+            }
+            if page:
+                params['page'] = page
+            response = self._request_page(params)
+            if not response:
+                break
+            if self.archive is not None and self.archive.recording:
+                self.archive.add_response(params, response)
+            results = response.get('results') or []
+            for article in results:
+                article['search_query'] = query
+            articles.extend(results)
+            page = response.get('nextPage')
+            if not page or not results:
+                break
+        return articles[:limit]
+
+    def fetch(self, queries: List[str], limit: int, country: str = 'in') -> List[Dict]:
+        """Fetch up to `limit` articles per query, deduplicated by article_id
+
+        An article returned by several queries keeps the first query (in the
+        order given) as its search_query.
+        """
+        start = time.time()
+        self.stats = {}
+        with ThreadPoolExecutor(max_workers=min(self.config.max_workers, len(queries)) or 1) as pool:
+            per_query = list(pool.map(lambda q: self.fetch_query(q, limit, country), queries))
+
+        seen = set()
+        articles = []
+        for results in per_query:
+            for article in results:
+                if article.get('article_id') in seen:
+                    self._count('duplicates')
+                    continue
+                seen.add(article.get('article_id'))
+                articles.append(article)
+        self.stats.update({
+            'queries': len(queries),
+            'articles': len(articles),
+            'credits_used': self.credits_used,
+            'elapsed_s': round(time.time() - start, 3)
+        })
+        print(f"Fetched {len(articles)} articles for {len(queries)} queries: {self.stats}")
+        return articles
@@ -1,11 +1,11 @@
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import numpy as np
 from typing import List, Dict, Union
-from langchain_ollama import OllamaLLM
-from langchain_core.prompts import PromptTemplate
 
 from config_entity import SentimentAnalysisConfig
+from components.sentiment_results import SentimentResults, STAGES
+from components.host_profile import load_host_profile, apply_thread_settings
 import os
+import json
 import pickle
 import time
 # from utils.logger import logger
@@ -15,55 +15,190 @@ class FinBERTSentimentAnalyzer:
         """Initialize FinBERT model"""
         self.config = config
         model_name = config.model_name if config else "ProsusAI/finbert"
+        # torch/transformers load here, not at import, so pages and pipelines that
+        # never score anything don't pay for them
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
         
+        # per-host threads and batch size written by scripts/autotune_inference.py
+        self.batch_size = config.batch_size if config else 16
+        self.host_profile = load_host_profile(config)
+        if self.host_profile:
+            apply_thread_settings(self.host_profile.get('num_threads'), self.host_profile.get('interop_threads'))
+            self.batch_size = self.host_profile.get('batch_size', self.batch_size)
+            print(f"Using host profile {self.host_profile['host']}: "
+                  f"{self.host_profile.get('num_threads')} threads, batch size {self.batch_size}")
+
         # logger.info(f"Loading FinBERT model: {model_name}")
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
         self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
         self.labels = ["positive", "negative", "neutral"]
         self.sentiment_data = None
+        self.cascade_report = None
         # logger.info("FinBERT model loaded successfully")
     
-    def analyze(self, news_text: str) -> Dict[str, any]:
-        """Analyze sentiment with probabilities"""
-        max_length = self.config.max_length if self.config else 512
-        
-        inputs = self.tokenizer(
-            news_text, 
-            return_tensors="pt",
-            truncation=True, 
-            max_length=max_length
-        )
-        
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        
-        scores = predictions[0].tolist()
+    def _predict(self, texts: List[str], max_length: int, batch_size: int):
+        """Score texts in padded batches, returns float32 (n, labels) scores and token counts"""
+        import torch
+        all_scores = np.empty((len(texts), len(self.labels)), dtype=np.float32)
+        token_counts = np.empty(len(texts), dtype=np.int64)
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            inputs = self.tokenizer(
+                batch,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=max_length
+            )
+            with torch.no_grad():
+                outputs = self.model(**inputs)
+                predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
+            all_scores[start:start + len(batch)] = predictions.numpy()
+            token_counts[start:start + len(batch)] = inputs["attention_mask"].sum(dim=1).numpy()
+        return all_scores, token_counts
+
+    def _to_result(self, scores: List[float], news_text: str) -> Dict[str, any]:
+        scores = [float(score) for score in scores]
         sentiment_dict = {label: score for label, score in zip(self.labels, scores)}
-        
+
         # Get primary sentiment
         primary_sentiment = self.labels[scores.index(max(scores))]
         confidence = max(scores)
-        
+
         return {
             "sentiment": primary_sentiment,
             "confidence": confidence,
             "scores": sentiment_dict,
             "text": news_text
         }
-    
-    def batch_analyze(self, news_list: List[str]) -> List[Dict]:
+
+    def analyze(self, news_text: str) -> Dict[str, any]:
+        """Analyze sentiment with probabilities"""
+        max_length = self.config.max_length if self.config else 512
+        scores, _ = self._predict([news_text], max_length, batch_size=1)
+        return self._to_result(scores[0], news_text)
+
+    def batch_analyze(self, news_list: List[Dict]) -> SentimentResults:
         """Analyze multiple news items"""
-        self.sentiment_data = [self.analyze(news['full_content']) for news in news_list]
-    
+        max_length = self.config.max_length if self.config else 512
+        texts = [news['full_content'] for news in news_list]
+        scores, _ = self._predict(texts, max_length, self.batch_size)
+        self.sentiment_data = SentimentResults(
+            [news.get('article_id') for news in news_list], scores, self.labels, articles=news_list
+        )
+        return self.sentiment_data
+
+    def _needs_escalation(self, scores: np.ndarray) -> np.ndarray:
+        """Low confidence, or neutral too close to call against the top label"""
+        ranked = np.argsort(-scores, axis=1)
+        rows = np.arange(len(scores))
+        top, second = ranked[:, 0], ranked[:, 1]
+        margin = scores[rows, top] - scores[rows, second]
+        neutral = self.labels.index("neutral")
+        borderline = ((top == neutral) | (second == neutral)) & (margin < self.config.cascade_neutral_margin)
+        return (scores[rows, top] < self.config.cascade_confidence_threshold) | borderline
+
+    def cascade_analyze(self, news_list: List[Dict]) -> SentimentResults:
+        """Score title + description first, full content only when the short pass is unsure
+
+        Articles with no title/description go straight to full-content scoring.
+        A fraction (cascade_audit_rate) of accepted short results is also scored
+        on full content so the disagreement rate of the cascade can be tracked.
+        Only rescored articles are tokenized at full length, so baseline_tokens
+        is partly an estimate (see baseline_estimated_articles).
+        """
+        config = self.config
+        start = time.time()
+        short_texts = [
+            ". ".join(part for part in (news.get('title'), news.get('description')) if part)
+            for news in news_list
+        ]
+        full_texts = [news.get('full_content') or short for news, short in zip(news_list, short_texts)]
+
+        has_short = np.array([i for i, text in enumerate(short_texts) if text], dtype=np.int64)
+        short_scores, short_tokens = self._predict(
+            [short_texts[i] for i in has_short], config.cascade_max_length, config.cascade_batch_size
+        )
+
+        escalated = np.ones(len(news_list), dtype=bool)
+        escalated[has_short] = self._needs_escalation(short_scores)
+        escalate = np.flatnonzero(escalated)
+        accepted = has_short[~escalated[has_short]]
+        # each accepted article is audited on its own draw, seeded so every run audits the same ones
+        draw = np.random.default_rng(config.cascade_audit_seed).random(len(accepted))
+        audit = accepted[draw < config.cascade_audit_rate]
+
+        rescore = np.concatenate([escalate, audit])
+        full_scores, rescore_tokens = self._predict(
+            [full_texts[i] for i in rescore], config.max_length, self.batch_size
+        )
+
+        scores = np.empty((len(news_list), len(self.labels)), dtype=np.float32)
+        scores[has_short] = short_scores
+        scores[escalate] = full_scores[:len(escalate)]
+        results = SentimentResults(
+            [news.get('article_id') for news in news_list], scores, self.labels,
+            stage=np.where(escalated, STAGES.index("full"), STAGES.index("short")),
+            articles=news_list
+        )
+
+        # disagreement is only measurable where both passes ran; audited articles are an
+        # unbiased sample of accepted results, escalated ones were picked for being unsure
+        short_label = np.full(len(news_list), -1, dtype=np.int64)
+        short_label[has_short] = short_scores.argmax(axis=1)
+        full_label = full_scores.argmax(axis=1)
+        audit_disagreements = int((short_label[audit] != full_label[len(escalate):]).sum())
+        compared = short_label[escalate] >= 0
+        escalated_disagreements = int((short_label[escalate][compared] != full_label[:len(escalate)][compared]).sum())
+        compared = int(compared.sum())
+
+        # what a full run would cost: counted for rescored articles, estimated for the rest
+        # from the tokens per character of the short texts the model saw untruncated
+        skipped = np.setdiff1d(np.arange(len(news_list)), rescore)
+        untruncated = short_tokens < config.cascade_max_length
+        short_chars = sum(len(short_texts[i]) for i in has_short[untruncated])
+        tokens_per_char = short_tokens[untruncated].sum() / short_chars if short_chars else 0.25
+        estimated = np.minimum(config.max_length, np.array([len(full_texts[i]) for i in skipped]) * tokens_per_char)
+        baseline_tokens = int(rescore_tokens.sum() + estimated.sum())
+        cascade_tokens = int(short_tokens.sum() + rescore_tokens.sum())
+        self.cascade_report = {
+            "articles": len(news_list),
+            "escalated": len(escalate),
+            "audited": len(audit),
+            "escalation_rate": len(escalate) / len(news_list) if news_list else 0.0,
+            "baseline_tokens": baseline_tokens,
+            "baseline_estimated_articles": len(skipped),
+            "cascade_tokens": cascade_tokens,
+            "tokens_saved": baseline_tokens - cascade_tokens,
+            "compute_saved_pct": 100 * (baseline_tokens - cascade_tokens) / baseline_tokens if baseline_tokens else 0.0,
+            "audit_disagreements": audit_disagreements,
+            "audit_disagreement_rate": audit_disagreements / len(audit) if len(audit) else 0.0,
+            "escalated_compared": compared,
+            "escalated_disagreements": escalated_disagreements,
+            "escalated_disagreement_rate": escalated_disagreements / compared if compared else 0.0,
+            "elapsed_s": time.time() - start
+        }
+        print(f"Cascade: {self.cascade_report['escalated']}/{self.cascade_report['articles']} escalated, "
+              f"{self.cascade_report['compute_saved_pct']:.1f}% tokens saved, "
+              f"{self.cascade_report['audit_disagreement_rate']:.1%} disagreement on {len(audit)} audited")
+        self.sentiment_data = results
+        return self.sentiment_data
+
     def save_sentiment_data(self):
         filepath = os.path.join(self.config.root_dir, 'news_sentiment.pkl')
         with open(filepath, 'wb') as f:
             pickle.dump(self.sentiment_data, f)
 
+    def save_cascade_report(self):
+        filepath = os.path.join(self.config.root_dir, 'cascade_report.json')
+        with open(filepath, 'w') as f:
+            json.dump(self.cascade_report, f, indent=2)
+
 class HybridFinancialAnalyzer:
     def __init__(self, config: SentimentAnalysisConfig = None):
         self.config = config
+        from langchain_ollama import OllamaLLM
+        from langchain_core.prompts import PromptTemplate
         self.finbert = FinBERTSentimentAnalyzer(config)
         self.llm = OllamaLLM(model="minimax-m2:cloud", temperature=0.1)
         
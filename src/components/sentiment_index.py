@@ -0,0 +1,256 @@
+import os
+import pickle
+import time
+from typing import List, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from config_entity import SentimentIndexConfig
+from components.sentiment_results import SentimentResults
+
+# exp() of anything larger overflows float64, so decay is rebased past this many e-folds
+_MAX_DECAY_EXPONENT = 600.0
+
+
+class SentimentIndexEngine:
+    """Per-ticker sentiment indices over time
+
+    For every (ticker, article) observation the engine computes
+      - rolling_mean: mean net sentiment (positive - negative) over `window`
+      - volume_weighted: the same window weighted by confidence * mention_count
+      - ewm_index: exponentially decayed, confidence-weighted sentiment (half-life
+        `halflife_hours`) over the ticker's full history
+      - article_count: articles in the window
+
+    Everything is columnar (sort + grouped cumsum + searchsorted), and the
+    engine keeps just enough state (decayed sums per ticker, the observations
+    still inside the window and the article ids already processed per ticker)
+    to process new articles without recomputing history or counting an
+    article twice.
+    """
+
+    def __init__(self, config: SentimentIndexConfig):
+        self.config = config
+        self.window = pd.Timedelta(config.window)
+        self.decay_rate = np.log(2) / (config.halflife_hours * 3600)
+        self.ewm_state = pd.DataFrame(
+            {'ewm_sum': pd.Series(dtype='float64'), 'ewm_weight': pd.Series(dtype='float64'),
+             'last_time': pd.Series(dtype='datetime64[ns]')}
+        ).rename_axis('symbol')
+        self.tail = self._empty_observations()
+        self.latest = pd.DataFrame()
+        self.seen = {}                      # symbol -> article ids already folded into the indices
+        self.state_path = os.path.join(config.root_dir, 'sentiment_index_state.pkl')
+
+    @staticmethod
+    def _empty_observations() -> pd.DataFrame:
+        return pd.DataFrame({
+            'symbol': pd.Series(dtype='object'),
+            'time': pd.Series(dtype='datetime64[ns]'),
+            'article_id': pd.Series(dtype='object'),
+            'net': pd.Series(dtype='float64'),
+            'confidence': pd.Series(dtype='float64'),
+            'weight': pd.Series(dtype='float64'),
+        })
+
+    @staticmethod
+    def build_observations(articles: List[Dict], sentiment_data, tags: List[Dict]) -> pd.DataFrame:
+        """Join scored articles with their ticker tags into one row per (ticker, article)
+
+        sentiment_data is a SentimentResults, matched to articles by
+        article_id, so the two may come from different runs; articles without
+        a score are dropped. Older pickles holding a list of result dicts
+        carry no ids and are only used when they are as long as articles.
+        """
+        article_ids = [article.get('article_id') for article in articles]
+        if not isinstance(sentiment_data, SentimentResults):
+            if len(sentiment_data) == len(articles):
+                sentiment_data = SentimentResults.from_records(sentiment_data, article_ids)
+            else:
+                print(f"Sentiment index: {len(sentiment_data)} sentiment records for {len(articles)} articles "
+                      f"cannot be matched without article ids")
+                sentiment_data = SentimentResults([], np.empty((0, 3)), ("positive", "negative", "neutral"))
+        results = sentiment_data.to_dataframe().drop_duplicates('article_id', keep='last')
+        published = pd.DataFrame({
+            'article_id': article_ids,
+            'time': pd.to_datetime([article.get('pubDate') for article in articles], errors='coerce'),
+        }).drop_duplicates('article_id', keep='last')
+        scored = published.merge(pd.DataFrame({
+            'article_id': results['article_id'].values,
+            'net': (results['positive_score'] - results['negative_score']).astype('float64').values,
+            'confidence': results['confidence'].astype('float64').values,
+        }), on='article_id', how='inner')
+        if len(scored) < len(published):
+            print(f"Sentiment index: {len(published) - len(scored)} articles have no sentiment score, skipped")
+        tagged = pd.DataFrame(tags, columns=['article_id', 'symbol', 'mention_count'])
+        observations = tagged.merge(scored, on='article_id', how='inner').dropna(subset=['time'])
+        observations['weight'] = observations['confidence'] * observations['mention_count']
+        return observations[['symbol', 'time', 'article_id', 'net', 'confidence', 'weight']]
+
+    def _ewm(self, obs: pd.DataFrame, state: pd.DataFrame) -> pd.DataFrame:
+        """Decayed confidence-weighted mean per ticker, seeded from `state`
+
+        Within a ticker, index_t = sum_i c_i x_i exp(-r (t - t_i)) / sum_i c_i exp(-r (t - t_i)).
+        The exp(-r t) factor cancels, so both sums are grouped cumsums of
+        exp(r (t_i - t0)); prior state enters as one pseudo-observation carrying
+        the decayed sums.
+        """
+        # decay each seed forward to the ticker's first new observation, so a long
+        # quiet gap never widens the exponent range of this batch
+        first_time = obs.groupby('symbol')['time'].min()
+        seeds = state.reindex(first_time.index).dropna()
+        gap = (first_time[seeds.index] - seeds['last_time']).dt.total_seconds().clip(lower=0)
+        decay = np.exp(-self.decay_rate * gap.values)
+        seed_rows = pd.DataFrame({
+            'symbol': seeds.index,
+            'time': first_time[seeds.index].values,
+            'wx': seeds['ewm_sum'].values * decay,
+            'w': seeds['ewm_weight'].values * decay,
+            'seed': True,
+        }, index=np.arange(-len(seeds), 0))
+        rows = pd.DataFrame({
+            'symbol': obs['symbol'].values,
+            'time': obs['time'].values,
+            'wx': (obs['confidence'] * obs['net']).values,
+            'w': obs['confidence'].values,
+            'seed': False,
+        }, index=obs.index)
+        combined = pd.concat([seed_rows, rows]).sort_values(['symbol', 'time', 'seed'],
+                                                            ascending=[True, True, False], kind='stable')
+
+        seconds = combined['time'].values.astype('datetime64[ns]').astype(np.int64) / 1e9
+        group_start = combined.groupby('symbol', sort=False)['time'].transform('min')
+        exponent = (seconds - group_start.values.astype('datetime64[ns]').astype(np.int64) / 1e9) * self.decay_rate
+
+        if exponent.max(initial=0.0) > _MAX_DECAY_EXPONENT:
+            # split at the first overflowing epoch, carry state across the split
+            early = exponent <= _MAX_DECAY_EXPONENT
+            real = ~combined['seed'].values
+            first_result = self._ewm(obs.loc[combined.index[early & real]], state)
+            carried = self._final_state(first_result, state)
+            rest_obs = obs.loc[combined.index[~early & real]]
+            return pd.concat([first_result, self._ewm(rest_obs, carried)])
+
+        growth = np.exp(exponent)
+        combined['cum_wx'] = (combined['wx'] * growth).groupby(combined['symbol'], sort=False).cumsum()
+        combined['cum_w'] = (combined['w'] * growth).groupby(combined['symbol'], sort=False).cumsum()
+        combined['ewm_index'] = combined['cum_wx'] / combined['cum_w']
+        # undo the growth factor so the carried sums are decayed to each row's own time
+        combined['ewm_sum'] = combined['cum_wx'] / growth
+        combined['ewm_weight'] = combined['cum_w'] / growth
+        result = combined[~combined['seed']]
+        return result[['symbol', 'time', 'ewm_index', 'ewm_sum', 'ewm_weight']]
+
+    @staticmethod
+    def _final_state(ewm_rows: pd.DataFrame, previous: pd.DataFrame) -> pd.DataFrame:
+        last = ewm_rows.groupby('symbol').tail(1).set_index('symbol')
+        state = last[['ewm_sum', 'ewm_weight']].assign(last_time=last['time'])
+        return pd.concat([previous[~previous.index.isin(state.index)], state])
+
+    def _rolling(self, obs: pd.DataFrame) -> pd.DataFrame:
+        """Time-window aggregates via cumulative sums and a searchsorted window start"""
+        obs = obs.sort_values(['symbol', 'time'], kind='stable')
+        codes, _ = pd.factorize(obs['symbol'])
+        # one sortable key per row: ticker code in the high part, seconds offset below
+        seconds = obs['time'].values.astype('datetime64[s]').astype(np.int64)
+        offsets = seconds - seconds.min() if len(seconds) else seconds
+        window = int(self.window.total_seconds())
+        span = int(offsets.max(initial=0)) + window + 1
+        keys = codes.astype(np.int64) * span + offsets
+        starts = np.searchsorted(keys, keys - window, side='right')
+        group_starts = np.searchsorted(keys, codes.astype(np.int64) * span, side='left')
+        starts = np.maximum(starts, group_starts)
+        ends = np.arange(1, len(obs) + 1)
+
+        def window_sum(values):
+            cumulative = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+            return cumulative[ends] - cumulative[starts]
+
+        net = obs['net'].values
+        weight = obs['weight'].values
+        count = ends - starts
+        return obs.assign(
+            rolling_mean=window_sum(net) / count,
+            volume_weighted=window_sum(weight * net) / np.maximum(window_sum(weight), 1e-12),
+            article_count=count,
+        )
+
+    def update(self, observations: pd.DataFrame) -> pd.DataFrame:
+        """Fold new observations into the indices, returns their index rows
+
+        Observations older than a ticker's last processed time are still
+        accepted, but decay is applied as if they arrived in order. An
+        (symbol, article_id) pair already processed, in this batch or an
+        earlier one, is dropped.
+        """
+        start = time.time()
+        new = observations.drop_duplicates(['symbol', 'article_id'])
+        repeated = [article_id in self.seen.get(symbol, ())
+                    for symbol, article_id in zip(new['symbol'], new['article_id'])]
+        new = new[~np.array(repeated, dtype=bool)].reset_index(drop=True)
+        if len(new) < len(observations):
+            print(f"Sentiment index: skipped {len(observations) - len(new)} already processed observations")
+        if new.empty:
+            return new
+        for symbol, article_ids in new.groupby('symbol')['article_id']:
+            self.seen.setdefault(symbol, set()).update(article_ids)
+
+        ewm_rows = self._ewm(new, self.ewm_state)
+        self.ewm_state = self._final_state(ewm_rows.sort_values(['symbol', 'time'], kind='stable'),
+                                           self.ewm_state)
+
+        # rolling windows only need the observations still inside the window
+        tail = self.tail.assign(_new=False)
+        combined = pd.concat([tail, new.assign(_new=True)], ignore_index=True)
+        rolled = self._rolling(combined)
+        rolled = rolled[rolled['_new']].drop(columns='_new')
+        rolled['ewm_index'] = ewm_rows['ewm_index'].reindex(rolled.index - len(tail)).values
+
+        horizon = combined.groupby('symbol')['time'].transform('max') - self.window
+        self.tail = combined[combined['time'] > horizon].drop(columns='_new').reset_index(drop=True)
+
+        latest = rolled.sort_values(['symbol', 'time'], kind='stable').groupby('symbol').tail(1).set_index('symbol')
+        self.latest = pd.concat([self.latest[~self.latest.index.isin(latest.index)], latest]) \
+            if not self.latest.empty else latest
+        print(f"Sentiment index: {len(new)} observations, {len(latest)} tickers updated "
+              f"in {(time.time() - start) * 1000:.0f} ms")
+        return rolled
+
+    def screener(self, top: int = 20, by: str = 'ewm_index', ascending: bool = False,
+                 as_of: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Rank tickers by their latest index value
+
+        as_of decays each ewm_index to a common timestamp (the index itself is
+        a weighted mean, so only its decayed weight shrinks; tickers that have
+        gone quiet drop below min_articles through article_count instead).
+        """
+        if self.latest.empty:
+            return self.latest
+        ranked = self.latest[self.latest['article_count'] >= self.config.min_articles].copy()
+        as_of = pd.Timestamp(as_of) if as_of is not None else ranked['time'].max()
+        state = self.ewm_state.reindex(ranked.index)
+        age = (as_of - state['last_time']).dt.total_seconds().clip(lower=0)
+        ranked['decayed_weight'] = state['ewm_weight'] * np.exp(-self.decay_rate * age)
+        ranked = ranked.rename(columns={'time': 'last_article'})
+        columns = ['last_article', 'ewm_index', 'rolling_mean', 'volume_weighted',
+                   'article_count', 'decayed_weight']
+        return ranked.sort_values(by, ascending=ascending)[columns].head(top)
+
+    def save_state(self):
+        with open(self.state_path, 'wb') as f:
+            pickle.dump({'ewm_state': self.ewm_state, 'tail': self.tail, 'latest': self.latest,
+                         'seen': self.seen}, f)
+
+    def load_state(self):
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'rb') as f:
+                state = pickle.load(f)
+            self.ewm_state = state['ewm_state']
+            self.tail = state['tail']
+            self.latest = state['latest']
+            # states saved before ids were tracked: the window tail is all that is known
+            self.seen = state.get('seen') or {
+                symbol: set(article_ids) for symbol, article_ids in self.tail.groupby('symbol')['article_id']
+            }
+        return self
@@ -0,0 +1,102 @@
+from typing import List, Dict, Optional, Sequence
+
+import numpy as np
+
+STAGES = ("full", "short")
+
+
+class SentimentResults:
+    """Columnar sentiment results for a batch of articles
+
+    One row per article: `scores` is a float32 (n, n_labels) probability
+    matrix in `labels` order, `label` the int8 argmax and `confidence` its
+    float32 probability. Article text is never copied: the articles list the
+    batch was scored from can be attached and is only referenced (and is
+    dropped when pickling), so saved results stay a few bytes per article.
+
+    Indexing and iteration yield the legacy per-article dicts
+    ({"sentiment", "confidence", "scores", "text"}) so older callers keep working.
+    """
+
+    def __init__(self, article_ids: Sequence[str], scores: np.ndarray, labels: Sequence[str],
+                 stage: Optional[np.ndarray] = None, articles: Optional[List[Dict]] = None):
+        self.article_ids = np.asarray(article_ids, dtype=object)
+        self.scores = np.asarray(scores, dtype=np.float32).reshape(len(self.article_ids), len(labels))
+        self.labels = tuple(labels)
+        self.label = self.scores.argmax(axis=1).astype(np.int8) if len(self.scores) else np.empty(0, np.int8)
+        self.confidence = self.scores.max(axis=1) if len(self.scores) else np.empty(0, np.float32)
+        self.stage = None if stage is None else np.asarray(stage, dtype=np.int8)
+        self.articles = articles
+
+    @classmethod
+    def from_records(cls, records: List[Dict], article_ids: Sequence[str],
+                     labels: Sequence[str] = ("positive", "negative", "neutral")) -> "SentimentResults":
+        """Convert legacy per-article result dicts (e.g. an old news_sentiment.pkl)"""
+        scores = np.array([[record['scores'][label] for label in labels] for record in records],
+                          dtype=np.float32)
+        return cls(article_ids, scores, labels)
+
+    def __len__(self):
+        return len(self.article_ids)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['articles'] = None
+        return state
+
+    def sentiment(self, i: int) -> str:
+        return self.labels[self.label[i]]
+
+    def text(self, i: int) -> Optional[str]:
+        if self.articles is None:
+            return None
+        return self.articles[i].get('full_content')
+
+    def __getitem__(self, i: int) -> Dict:
+        record = {
+            "sentiment": self.sentiment(i),
+            "confidence": float(self.confidence[i]),
+            "scores": {label: float(score) for label, score in zip(self.labels, self.scores[i])},
+            "text": self.text(i)
+        }
+        if self.stage is not None:
+            record["stage"] = STAGES[self.stage[i]]
+        return record
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def to_dataframe(self):
+        import pandas as pd
+        data = {'article_id': self.article_ids}
+        data.update({f"{label}_score": self.scores[:, j] for j, label in enumerate(self.labels)})
+        data['sentiment'] = pd.Categorical.from_codes(self.label, categories=list(self.labels))
+        data['confidence'] = self.confidence
+        if self.stage is not None:
+            data['stage'] = pd.Categorical.from_codes(self.stage, categories=list(STAGES))
+        return pd.DataFrame(data)
+
+    def to_parquet(self, filepath: str):
+        self.to_dataframe().to_parquet(filepath, index=False)
+
+    def to_db_rows(self, model_name: str, processing_time_ms: float = 0.0) -> List[Dict]:
+        """Rows in the shape Database.insert_sentiment expects"""
+        zeros = [0.0] * len(self)
+        columns = {label: self.scores[:, j].tolist() for j, label in enumerate(self.labels)}
+        positive = columns.get('positive', zeros)
+        negative = columns.get('negative', zeros)
+        neutral = columns.get('neutral', zeros)
+        confidence = self.confidence.tolist()
+        return [
+            {
+                'article_id': article_id,
+                'model_name': model_name,
+                'sentiment': self.labels[code],
+                'confidence': confidence[i],
+                'positive_score': positive[i],
+                'negative_score': negative[i],
+                'neutral_score': neutral[i],
+                'processing_time_ms': processing_time_ms
+            }
+            for i, (article_id, code) in enumerate(zip(self.article_ids.tolist(), self.label.tolist()))
+        ]
@@ -0,0 +1,97 @@
+import re
+from typing import List, Dict
+
+# a date/time with nothing else: "10 Mar 2025, 09:45 AM IST", "March 3, 2025 | 14:02"
+_DATE = (r"(?:(?:[\d:/.,|\-]+|(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+         r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b\.?"
+         r"|(?:mon|tues?|wed(?:nes)?|thu(?:rs)?|fri|sat(?:ur)?|sun)(?:day)?\b,?|am|pm|ist|gmt|utc|hrs)\s*)+")
+
+# whole lines that carry no article content; newspaper puts each paragraph on
+# one line, so every pattern must only match the boilerplate form of the line
+BOILERPLATE_LINE_PATTERNS = [
+    r"advertisement|sponsored|story continues below(?: this ad)?",
+    r"(?:also read|read also|read more|must read|also see|also watch)\s*(?:[:|\-–]\s*.{0,200})?",
+    r"(?:recommended|related|top|trending|latest) (?:stories|news|articles|videos|for you)\s*:?",
+    r"(?:disclaimer|disclosure)\s*[:\-|].*",
+    r"(?:subscribe|sign up|log ?in|register)(?: now| here| today)?"
+    r"(?:\s+(?:to|for)\s+(?:our|free|a free)\b.{0,80})?[.!]?",
+    r"\(?(?:with inputs from|edited by|written by|reported by|compiled by)\b[^.]{0,80}\)?\.?",
+    r"(?:first published|published|last updated|updated)\s*(?:on|at)?\s*:?\s*" + _DATE,
+    r"(?:image|photo|file photo|representational image)(?:\s*(?:source|credit)s?)?\s*:.{0,120}",
+    r"(?:follow us on|join our|download the (?:\w+ )?app|catch all the|get live share market updates|"
+    r"click here|tap here|share this article)\b.{0,200}",
+    r"(?:\w+ )?(?:whatsapp|telegram|google news) channel\b.{0,120}",
+]
+
+# bylines are matched case-sensitively so ordinary sentences starting with "by"
+# survive; only names (and an optional ", Agency"/"| Place") with no sentence after
+_NAME = r"(?!(?:January|February|March|April|May|June|July|August|September|October|November|December|" \
+        r"Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\b)[A-Z][\w.'\-]*"
+BYLINE_PATTERN = rf"By\s+{_NAME}(?:\s+(?:{_NAME}|and|&))*(?:\s*[,|]\s*[A-Z][\w.'\-]*(?:\s+[A-Z][\w.'\-]*)*)?"
+
+# fragments inside otherwise useful lines
+INLINE_PATTERNS = [
+    r"\((?:image|photo|representational image|file photo)(?:\s*(?:source|credit)s?)?\s*:[^)]{0,120}\)",
+]
+
+# rough stand-in for subword tokens: words, numbers and punctuation marks
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    return len(_TOKEN_PATTERN.findall(text)) if text else 0
+
+
+class TextCleaner:
+    """Strips boilerplate lines and collapses whitespace in scraped article text
+
+    All line patterns are compiled into a single alternation, so every line is
+    tested with one regex match; repeated lines (newspaper often extracts the
+    same paragraph twice) are dropped as well.
+    """
+
+    def __init__(self, extra_patterns: List[str] = None):
+        line_patterns = BOILERPLATE_LINE_PATTERNS + list(extra_patterns or [])
+        self.line_regex = re.compile(
+            r"^\s*(?:" + "|".join(f"(?:{p})" for p in line_patterns) + r")\s*$",
+            re.IGNORECASE
+        )
+        self.byline_regex = re.compile(r"^\s*" + BYLINE_PATTERN + r"\s*$")
+        self.inline_regex = re.compile("|".join(INLINE_PATTERNS), re.IGNORECASE)
+        self.spaces_regex = re.compile(r"[ \t\u00a0\u200b]+")
+        self.stats = {'articles': 0, 'tokens_before': 0, 'tokens_after': 0}
+
+    def clean(self, text: str) -> str:
+        if not text:
+            return text or ''
+        kept = []
+        seen = set()
+        for line in text.splitlines():
+            line = self.spaces_regex.sub(' ', self.inline_regex.sub('', line)).strip()
+            if not line or line in seen:
+                continue
+            if self.line_regex.match(line) or self.byline_regex.match(line):
+                continue
+            seen.add(line)
+            kept.append(line)
+        return '\n'.join(kept)
+
+    def clean_article(self, article: Dict) -> Dict:
+        """Clean full_content in place and record the tokens removed"""
+        original = article.get('full_content') or ''
+        cleaned = self.clean(original)
+        tokens_before, tokens_after = count_tokens(original), count_tokens(cleaned)
+        article['full_content'] = cleaned
+        article['tokens_saved'] = tokens_before - tokens_after
+        self.stats['articles'] += 1
+        self.stats['tokens_before'] += tokens_before
+        self.stats['tokens_after'] += tokens_after
+        return article
+
+    def report(self) -> Dict:
+        saved = self.stats['tokens_before'] - self.stats['tokens_after']
+        return {
+            **self.stats,
+            'tokens_saved': saved,
+            'tokens_saved_pct': 100 * saved / self.stats['tokens_before'] if self.stats['tokens_before'] else 0.0
+        }
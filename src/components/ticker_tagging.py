@@ -0,0 +1,187 @@
+import csv
+import os
+import pickle
+import re
+import time
+from collections import deque
+from typing import List, Dict, Tuple
+
+from config_entity import TickerTaggingConfig
+
+COMPANY_SUFFIX = re.compile(r"\s+(?:limited|ltd\.?)$", re.IGNORECASE)
+
+
+def fold_case(text: str) -> str:
+    """Lower-case one character at a time, keeping the length (and so every offset) of text
+
+    str.lower() can lengthen a string ('İ' becomes 'i' + a combining dot),
+    which would shift the offsets of every later match.
+    """
+    return ''.join(char.lower()[:1] for char in text)
+
+
+def load_equity_list(path, exchange: str = 'NSE') -> List[Dict]:
+    """Dictionary rows from an exchange equity list (NSE EQUITY_L.csv: SYMBOL, NAME OF COMPANY, ...)
+
+    The company name without its "Limited"/"Ltd" suffix becomes the alias;
+    bare symbols are not used, most of them are ordinary words or initials.
+    """
+    rows = []
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            row = {(key or '').strip().upper(): (value or '').strip() for key, value in row.items()}
+            symbol, name = row.get('SYMBOL'), row.get('NAME OF COMPANY')
+            if symbol and name:
+                rows.append({'symbol': symbol, 'exchange': exchange, 'name': COMPANY_SUFFIX.sub('', name),
+                             'aliases': name})
+    return rows
+
+
+class AhoCorasick:
+    """Multi-pattern automaton: finds every dictionary alias in one pass over the text
+
+    Patterns are matched on case-folded text; each pattern carries a payload
+    (here the ticker symbol) and an optional case-sensitive original form.
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self.patterns = []
+
+    def add(self, pattern: str, payload, case_sensitive: bool = False):
+        node = 0
+        for char in fold_case(pattern):
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = next_node
+        self.output[node].append(len(self.patterns))
+        self.patterns.append((pattern, payload, case_sensitive))
+
+    def build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+        return self
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, pattern_id) for every match, overlaps included"""
+        goto, fail, output = self.goto, self.fail, self.output
+        node = 0
+        for end, char in enumerate(fold_case(text), 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern_id in output[node]:
+                yield end - len(self.patterns[pattern_id][0]), end, pattern_id
+
+
+class TickerTagger:
+    def __init__(self, config: TickerTaggingConfig):
+        """Tag articles with the NSE/BSE companies they mention"""
+        self.config = config
+        self.symbols = {}
+        self.automaton = AhoCorasick()
+        self.article_tags = None
+        self._load_dictionary(config.dictionary_path)
+
+    @staticmethod
+    def _is_case_sensitive(alias: str) -> bool:
+        # short all-caps aliases (SBI, TCS, ITC, L&T) would otherwise hit ordinary words
+        return len(alias) <= 5 and not any(char.islower() for char in alias)
+
+    def _load_dictionary(self, dictionary_path):
+        with open(dictionary_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                self._add_company(row)
+        # the curated dictionary carries aliases, the exchange list fills in every other listed company
+        equity_list_path = self.config.equity_list_path
+        if equity_list_path and os.path.exists(equity_list_path):
+            curated = len(self.symbols)
+            for row in load_equity_list(equity_list_path):
+                if row['symbol'] not in self.symbols:
+                    self._add_company(row)
+            print(f"Loaded {curated} curated and {len(self.symbols) - curated} equity list companies")
+        self.automaton.build()
+
+    def _add_company(self, row: Dict):
+        symbol = row['symbol'].strip()
+        self.symbols[symbol] = {'exchange': row.get('exchange', ''), 'name': row['name'].strip()}
+        aliases = {row['name'].strip()}
+        aliases.update(alias.strip() for alias in (row.get('aliases') or '').split('|'))
+        for alias in aliases:
+            if len(alias) >= self.config.min_alias_length:
+                self.automaton.add(alias, symbol, self._is_case_sensitive(alias))
+
+    @staticmethod
+    def _at_word_boundary(text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else ' '
+        after = text[end] if end < len(text) else ' '
+        return not before.isalnum() and not after.isalnum()
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Non-overlapping (start, end, symbol) matches, longest alias wins"""
+        if not text:
+            return []
+        candidates = []
+        for start, end, pattern_id in self.automaton.iter_matches(text):
+            pattern, symbol, case_sensitive = self.automaton.patterns[pattern_id]
+            if not self._at_word_boundary(text, start, end):
+                continue
+            if case_sensitive and text[start:end] != pattern:
+                continue
+            candidates.append((start, end, symbol))
+
+        candidates.sort(key=lambda match: (match[0], match[0] - match[1]))
+        matches, covered_until = [], 0
+        for start, end, symbol in candidates:
+            if start >= covered_until:
+                matches.append((start, end, symbol))
+                covered_until = end
+        return matches
+
+    def tag(self, article: Dict) -> List[Dict]:
+        title = article.get('title') or ''
+        content = article.get('full_content') or ''
+        counts = {}
+        in_title = set()
+        for _, _, symbol in self.find(title):
+            counts[symbol] = counts.get(symbol, 0) + 1
+            in_title.add(symbol)
+        for _, _, symbol in self.find(content):
+            counts[symbol] = counts.get(symbol, 0) + 1
+        return [
+            {
+                'article_id': article.get('article_id'),
+                'symbol': symbol,
+                'exchange': self.symbols[symbol]['exchange'],
+                'mention_count': count,
+                'in_title': symbol in in_title
+            }
+            for symbol, count in sorted(counts.items(), key=lambda item: -item[1])
+        ]
+
+    def tag_articles(self, articles: List[Dict]) -> List[Dict]:
+        start = time.time()
+        self.article_tags = [tag for article in articles for tag in self.tag(article)]
+        print(f"Tagged {len(articles)} articles with {len(self.article_tags)} ticker mentions "
+              f"in {time.time() - start:.2f} s")
+        return self.article_tags
+
+    def save_tags(self):
+        filepath = os.path.join(self.config.root_dir, 'article_tickers.pkl')
+        with open(filepath, 'wb') as f:
+            pickle.dump(self.article_tags, f)
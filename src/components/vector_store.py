@@ -0,0 +1,430 @@
+import os
+import pickle
+import time
+from datetime import datetime
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from config_entity import VectorStoreConfig
+from components.sentiment_results import SentimentResults
+
+SENTIMENT_CODES = {"positive": 0, "negative": 1, "neutral": 2}
+
+
+class ArticleEmbedder:
+    def __init__(self, config: VectorStoreConfig):
+        """Mean-pooled, L2-normalised sentence embeddings from a local transformer"""
+        from transformers import AutoTokenizer, AutoModel
+        self.config = config
+        self.tokenizer = AutoTokenizer.from_pretrained(config.embedding_model)
+        self.model = AutoModel.from_pretrained(config.embedding_model)
+        self.model.eval()
+        self.dim = self.model.config.hidden_size
+
+    @staticmethod
+    def article_text(article: Dict) -> str:
+        parts = (article.get('title'), article.get('description'), article.get('full_content'))
+        return ". ".join(part for part in parts if part)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        import torch
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), self.config.batch_size):
+            batch = texts[start:start + self.config.batch_size]
+            inputs = self.tokenizer(
+                batch,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=self.config.max_length
+            )
+            with torch.no_grad():
+                hidden = self.model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            pooled = torch.nn.functional.normalize(pooled, dim=-1)
+            vectors[start:start + len(batch)] = pooled.numpy()
+        return vectors
+
+
+class EmbeddingCache:
+    """Memory-mapped embedding matrix keyed by article_id
+
+    Rows are appended to a raw float16/float32 file that grows by doubling, so
+    already-embedded articles are never recomputed and the matrix is paged in
+    by the OS instead of being held in memory.
+    """
+
+    def __init__(self, root_dir: str, dim: int, dtype: str = "float16"):
+        self.root_dir = root_dir
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.matrix_path = os.path.join(root_dir, 'embeddings.bin')
+        self.meta_path = os.path.join(root_dir, 'embeddings_meta.pkl')
+        self.ids = []
+        self.id_to_row = {}
+        self.capacity = 0
+        self._matrix = None
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'rb') as f:
+                meta = pickle.load(f)
+            if meta['dim'] != dim or meta['dtype'] != self.dtype.name:
+                raise ValueError(
+                    f"Embedding cache at {root_dir} holds dim={meta['dim']} {meta['dtype']}, "
+                    f"expected dim={dim} {self.dtype.name}. Clear it or change vector_store.root_dir."
+                )
+            self.ids = meta['ids']
+            self.id_to_row = {article_id: row for row, article_id in enumerate(self.ids)}
+            self.capacity = meta['capacity']
+            self._open()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, article_id):
+        return article_id in self.id_to_row
+
+    def _open(self):
+        self._matrix = np.memmap(self.matrix_path, dtype=self.dtype, mode='r+',
+                                 shape=(self.capacity, self.dim))
+
+    def _grow(self, needed: int):
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, 2 * self.capacity, 1024)
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with open(self.matrix_path, 'ab') as f:
+            f.truncate(new_capacity * self.dim * self.dtype.itemsize)
+        self.capacity = new_capacity
+        self._open()
+
+    def missing(self, article_ids: List[str]) -> List[str]:
+        return [article_id for article_id in article_ids if article_id not in self.id_to_row]
+
+    def add(self, article_ids: List[str], vectors: np.ndarray) -> np.ndarray:
+        """Append vectors for new article ids, returns their row numbers"""
+        start = len(self.ids)
+        self._grow(start + len(article_ids))
+        self._matrix[start:start + len(article_ids)] = vectors.astype(self.dtype)
+        for offset, article_id in enumerate(article_ids):
+            self.id_to_row[article_id] = start + offset
+        self.ids.extend(article_ids)
+        return np.arange(start, start + len(article_ids))
+
+    def rows(self, article_ids: List[str]) -> np.ndarray:
+        return np.array([self.id_to_row[article_id] for article_id in article_ids], dtype=np.int64)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        if self._matrix is None:
+            return np.empty((0, self.dim), dtype=self.dtype)
+        return self._matrix[:len(self.ids)]
+
+    def save(self):
+        if self._matrix is not None:
+            self._matrix.flush()
+        with open(self.meta_path, 'wb') as f:
+            pickle.dump({
+                'ids': self.ids,
+                'dim': self.dim,
+                'dtype': self.dtype.name,
+                'capacity': self.capacity
+            }, f)
+
+
+class IVFIndex:
+    """Inverted-file ANN index over unit vectors (inner product == cosine)
+
+    A spherical k-means quantizer splits the rows into nlist cells; a query
+    only scans the nprobe cells whose centroids are closest to it.
+    """
+
+    def __init__(self, nlist: int = 0, nprobe: int = 8, seed: int = 42):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.seed = seed
+        self.centroids = None
+        self.assignments = np.empty(0, dtype=np.int32)
+        self.trained_size = 0
+        self._order = None
+        self._offsets = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _assign(self, vectors: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk):
+            block = np.asarray(vectors[start:start + chunk], dtype=np.float32)
+            assignments[start:start + chunk] = np.argmax(block @ self.centroids.T, axis=1)
+        return assignments
+
+    def train(self, vectors: np.ndarray, iterations: int = 10):
+        n = len(vectors)
+        nlist = self.nlist or max(1, int(np.sqrt(n)))
+        nlist = min(nlist, n)
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(n, 64 * nlist)
+        sample = np.asarray(vectors[np.sort(rng.choice(n, sample_size, replace=False))], dtype=np.float32)
+
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            # re-seed empty cells from random sample points
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+
+        self.centroids = centroids.astype(np.float32)
+        self.nlist = nlist
+        self.assignments = self._assign(vectors)
+        self.trained_size = n
+        self._build_lists()
+
+    def add(self, vectors: np.ndarray):
+        """Assign new rows (appended after the existing ones) to their cells"""
+        self.assignments = np.concatenate([self.assignments, self._assign(vectors)])
+        self._build_lists()
+
+    def _build_lists(self):
+        self._order = np.argsort(self.assignments, kind='stable').astype(np.int64)
+        counts = np.bincount(self.assignments, minlength=self.nlist)
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        cells = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        rows = [self._order[self._offsets[c]:self._offsets[c + 1]] for c in cells]
+        return np.sort(np.concatenate(rows))
+
+    def save(self, filepath: str):
+        np.savez(filepath, centroids=self.centroids, assignments=self.assignments,
+                 meta=np.array([self.nlist, self.nprobe, self.trained_size]))
+
+    @classmethod
+    def load(cls, filepath: str) -> "IVFIndex":
+        data = np.load(filepath)
+        nlist, nprobe, trained_size = (int(v) for v in data['meta'])
+        index = cls(nlist=nlist, nprobe=nprobe)
+        index.centroids = data['centroids']
+        index.assignments = data['assignments']
+        index.trained_size = trained_size
+        index._build_lists()
+        return index
+
+
+class VectorStore:
+    def __init__(self, config: VectorStoreConfig):
+        """Local article vector store: embedding cache + IVF index + metadata filters"""
+        self.config = config
+        self.embedder = None
+        self.cache = None
+        self.index = None
+        self.sentiment = np.empty(0, dtype=np.int8)
+        self.source = np.empty(0, dtype=np.int32)
+        self.pub_date = np.empty(0, dtype='datetime64[s]')
+        self.sources = {}
+        self.metadata_path = os.path.join(config.root_dir, 'metadata.pkl')
+        self.index_path = os.path.join(config.root_dir, 'ivf_index.npz')
+
+    def _load_embedder(self):
+        if self.embedder is None:
+            self.embedder = ArticleEmbedder(self.config)
+        return self.embedder
+
+    def load(self, dim: Optional[int] = None):
+        """Open the cache and index; dim defaults to the embedding model's hidden size"""
+        dim = dim or self._load_embedder().dim
+        self.cache = EmbeddingCache(self.config.root_dir, dim, self.config.dtype)
+        if os.path.exists(self.metadata_path):
+            with open(self.metadata_path, 'rb') as f:
+                meta = pickle.load(f)
+            self.sentiment = meta['sentiment']
+            self.source = meta['source']
+            self.pub_date = meta['pub_date']
+            self.sources = meta['sources']
+        if os.path.exists(self.index_path):
+            self.index = IVFIndex.load(self.index_path)
+            self.index.nprobe = self.config.nprobe
+        return self
+
+    def save(self):
+        self.cache.save()
+        with open(self.metadata_path, 'wb') as f:
+            pickle.dump({
+                'sentiment': self.sentiment,
+                'source': self.source,
+                'pub_date': self.pub_date,
+                'sources': self.sources
+            }, f)
+        if self.index is not None:
+            self.index.save(self.index_path)
+
+    @staticmethod
+    def _parse_date(value) -> np.datetime64:
+        if not value:
+            return np.datetime64('NaT', 's')
+        if isinstance(value, datetime):
+            return np.datetime64(value, 's')
+        try:
+            return np.datetime64(str(value).replace(' ', 'T'), 's')
+        except ValueError:
+            return np.datetime64('NaT', 's')
+
+    def _source_code(self, source: Optional[str]) -> int:
+        if not source:
+            return -1
+        return self.sources.setdefault(source, len(self.sources))
+
+    def add_articles(self, articles: List[Dict], sentiment_data: Optional[List[Dict]] = None) -> int:
+        """Embed articles that are not cached yet and add them to the index
+
+        sentiment_data, when given, is a SentimentResults (matched to articles
+        by article_id) or a list of result dicts aligned with articles, and
+        feeds the sentiment filter. Articles that are already cached only get
+        their sentiment, source and date refreshed.
+        """
+        if self.cache is None:
+            self.load()
+        if sentiment_data is None:
+            sentiment_of = {}
+        elif isinstance(sentiment_data, SentimentResults):
+            sentiment_of = {article_id: sentiment_data.sentiment(i)
+                            for i, article_id in enumerate(sentiment_data.article_ids)}
+        elif len(sentiment_data) == len(articles):
+            sentiment_of = {article.get('article_id'): record.get('sentiment')
+                            for article, record in zip(articles, sentiment_data)}
+        else:
+            print(f"Vector store: {len(sentiment_data)} sentiment records for {len(articles)} articles "
+                  f"cannot be matched, sentiment left unchanged")
+            sentiment_of = {}
+
+        seen = set()
+        new, cached = [], []
+        for article in articles:
+            article_id = article.get('article_id')
+            if not article_id or article_id in seen:
+                continue
+            seen.add(article_id)
+            (cached if article_id in self.cache else new).append(article)
+        self._update_metadata(cached, sentiment_of)
+        if not new:
+            print(f"Vector store: all articles already embedded, metadata refreshed for {len(cached)}")
+            return 0
+
+        start = time.time()
+        embedder = self._load_embedder()
+        vectors = embedder.embed([embedder.article_text(article) for article in new])
+        self.cache.add([article['article_id'] for article in new], vectors)
+
+        self.sentiment = np.concatenate([self.sentiment, np.array(
+            [SENTIMENT_CODES.get(sentiment_of.get(article['article_id']), -1) for article in new], dtype=np.int8)])
+        self.source = np.concatenate([self.source, np.array(
+            [self._source_code(article.get('source')) for article in new], dtype=np.int32)])
+        self.pub_date = np.concatenate([self.pub_date, np.array(
+            [self._parse_date(article.get('pubDate')) for article in new], dtype='datetime64[s]')])
+
+        # retrain the quantizer once the store has grown well past what it was trained on
+        if self.index is None or len(self.cache) > 4 * self.index.trained_size:
+            self.index = IVFIndex(nlist=self.config.nlist, nprobe=self.config.nprobe)
+            self.index.train(self.cache.vectors)
+        else:
+            self.index.add(vectors)
+        print(f"Vector store: embedded {len(new)} new articles in {time.time() - start:.2f} s "
+              f"({len(self.cache)} total, metadata refreshed for {len(cached)})")
+        return len(new)
+
+    def _update_metadata(self, articles: List[Dict], sentiment_of: Dict):
+        """Overwrite filter metadata of cached articles with the values given now"""
+        if not articles:
+            return
+        rows = self.cache.rows([article['article_id'] for article in articles])
+        for row, article in zip(rows, articles):
+            sentiment = sentiment_of.get(article['article_id'])
+            if sentiment is not None:
+                self.sentiment[row] = SENTIMENT_CODES.get(sentiment, -1)
+            if article.get('source'):
+                self.source[row] = self._source_code(article.get('source'))
+            if article.get('pubDate'):
+                self.pub_date[row] = self._parse_date(article.get('pubDate'))
+
+    def _filter_mask(self, sentiment=None, source=None, start_date=None, end_date=None):
+        mask = None
+
+        def combine(current, condition):
+            return condition if current is None else current & condition
+
+        if sentiment is not None:
+            mask = combine(mask, self.sentiment == SENTIMENT_CODES.get(sentiment, -2))
+        if source is not None:
+            mask = combine(mask, self.source == self.sources.get(source, -2))
+        if start_date is not None:
+            mask = combine(mask, self.pub_date >= self._parse_date(start_date))
+        if end_date is not None:
+            mask = combine(mask, self.pub_date <= self._parse_date(end_date))
+        return mask
+
+    def search(self, query_vector: np.ndarray, k: int = 10, exclude_row: Optional[int] = None,
+               **filters) -> List[Dict]:
+        """Top-k stored articles by cosine similarity, fewer only when fewer rows match the filters"""
+        query = np.asarray(query_vector, dtype=np.float32).ravel()
+        mask = self._filter_mask(**filters)
+        n = len(self.cache)
+
+        # very selective filters: scanning the matching rows beats probing cells
+        if mask is not None and mask.sum() <= self.config.brute_force_threshold:
+            rows = np.flatnonzero(mask)
+        elif self.index is not None and self.index.is_trained:
+            # filters drop candidates after the probe, so widen it until k rows pass (or every cell is probed)
+            needed = k + (exclude_row is not None)
+            nprobe = self.index.nprobe
+            while True:
+                rows = self.index.candidates(query, nprobe)
+                if mask is not None:
+                    rows = rows[mask[rows]]
+                if len(rows) >= needed or nprobe >= self.index.nlist:
+                    break
+                nprobe *= 2
+        else:
+            rows = np.arange(n) if mask is None else np.flatnonzero(mask)
+
+        if exclude_row is not None:
+            rows = rows[rows != exclude_row]
+        if len(rows) == 0:
+            return []
+
+        scores = np.asarray(self.cache.vectors[rows], dtype=np.float32) @ query
+        top = min(k, len(rows))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        labels = {code: label for label, code in SENTIMENT_CODES.items()}
+        sources = {code: name for name, code in self.sources.items()}
+        return [
+            {
+                'article_id': self.cache.ids[rows[i]],
+                'score': float(scores[i]),
+                'sentiment': labels.get(int(self.sentiment[rows[i]])),
+                'source': sources.get(int(self.source[rows[i]])),
+                'pubDate': None if np.isnat(self.pub_date[rows[i]]) else str(self.pub_date[rows[i]])
+            }
+            for i in best
+        ]
+
+    def similar_articles(self, article_id: str, k: int = 10, **filters) -> List[Dict]:
+        """Nearest neighbours of an already-stored article"""
+        row = self.cache.id_to_row[article_id]
+        return self.search(self.cache.vectors[row], k=k, exclude_row=row, **filters)
+
+    def query(self, text: str, k: int = 10, **filters) -> List[Dict]:
+        """Semantic search with free text"""
+        vector = self._load_embedder().embed([text])[0]
+        return self.search(vector, k=k, **filters)
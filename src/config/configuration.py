@@ -1,5 +1,5 @@
 from constants import *
-from config_entity import DataIngestionConfig, SentimentAnalysisConfig, DatabaseConfig
+from config_entity import DataIngestionConfig, SentimentAnalysisConfig, DatabaseConfig, VectorStoreConfig, TickerTaggingConfig, SentimentIndexConfig, ModelRegistryConfig, ScoringModelConfig
 from utils.common import read_yaml, create_directories
 
 class ConfigurationManager:
@@ -12,19 +12,102 @@ class ConfigurationManager:
         create_directories([config.root_dir])
         data_ingestion_config = DataIngestionConfig(
             root_dir=config.root_dir,
-            query= config.query
+            query= config.query,
+            base_url= config.get('base_url', 'https://newsdata.io/api/1'),
+            page_size= config.get('page_size', 10),
+            requests_per_second= config.get('requests_per_second', 0.5),
+            burst= config.get('burst', 5),
+            max_credits= config.get('max_credits', 200),
+            max_workers= config.get('max_workers', 4),
+            max_retries= config.get('max_retries', 3),
+            timeout= config.get('timeout', 30.0),
+            mode= config.get('mode', 'live'),
+            archive_path= config.get('archive_path', 'artifacts/data_ingestion/news_archive.zip'),
+            replay_latency= config.get('replay_latency', 0.0),
+            replay_error_rate= config.get('replay_error_rate', 0.0),
+            replay_seed= config.get('replay_seed', 42),
+            clean_text= config.get('clean_text', False),
+            boilerplate_patterns= config.get('boilerplate_patterns', None)
         )
         return data_ingestion_config
     
+    def get_ticker_tagging_config(self):
+        config = self.config.ticker_tagging
+        create_directories([config.root_dir])
+        ticker_tagging_config = TickerTaggingConfig(
+            root_dir=config.root_dir,
+            dictionary_path=config.dictionary_path,
+            min_alias_length=config.get('min_alias_length', 2),
+            equity_list_path=config.get('equity_list_path')
+        )
+        return ticker_tagging_config
+
     def get_sentiment_analysis_config(self):
         config = self.config.sentiment_analysis
+        cascade = config.get('cascade', {})
         sentiment_analysis_config = SentimentAnalysisConfig(
             model_name= config.model_name,
+            batch_size= config.get('batch_size', 16),
             max_length= config.max_length,
-            root_dir=config.root_dir
+            root_dir=config.root_dir,
+            use_host_profile= config.get('use_host_profile', True),
+            host_profile_dir= config.get('host_profile_dir', 'artifacts/sentiment/host_profiles'),
+            cascade_enabled= cascade.get('enabled', False),
+            cascade_batch_size= cascade.get('batch_size', 64),
+            cascade_max_length= cascade.get('max_length', 128),
+            cascade_confidence_threshold= cascade.get('confidence_threshold', 0.80),
+            cascade_neutral_margin= cascade.get('neutral_margin', 0.15),
+            cascade_audit_rate= cascade.get('audit_rate', 0.05),
+            cascade_audit_seed= cascade.get('audit_seed', 42)
         )
         return sentiment_analysis_config
     
+    def get_model_registry_config(self):
+        config = self.config.model_registry
+        create_directories([config.root_dir])
+        model_registry_config = ModelRegistryConfig(
+            root_dir=config.root_dir,
+            models=tuple(
+                ScoringModelConfig(
+                    model_name=model.model_name,
+                    name=model.get('name'),
+                    batch_size=model.get('batch_size', 16),
+                    max_length=model.get('max_length', 512),
+                    labels=tuple(model.labels) if model.get('labels') else None
+                )
+                for model in config.models
+            ),
+            max_loaded_models=config.get('max_loaded_models', 2),
+            store_in_db=config.get('store_in_db', True)
+        )
+        return model_registry_config
+
+    def get_sentiment_index_config(self):
+        config = self.config.sentiment_index
+        create_directories([config.root_dir])
+        sentiment_index_config = SentimentIndexConfig(
+            root_dir=config.root_dir,
+            window=config.get('window', '3D'),
+            halflife_hours=config.get('halflife_hours', 24.0),
+            min_articles=config.get('min_articles', 1)
+        )
+        return sentiment_index_config
+
+    def get_vector_store_config(self):
+        config = self.config.vector_store
+        create_directories([config.root_dir])
+        vector_store_config = VectorStoreConfig(
+            root_dir=config.root_dir,
+            embedding_model=config.embedding_model,
+            batch_size=config.get('batch_size', 32),
+            max_length=config.get('max_length', 256),
+            dtype=config.get('dtype', 'float16'),
+            nlist=config.get('nlist', 0),
+            nprobe=config.get('nprobe', 8),
+            brute_force_threshold=config.get('brute_force_threshold', 20000)
+        )
+        return vector_store_config
+
     def get_database_config(self):
         config = self.config.database
         database_config = DatabaseConfig(
@@ -36,6 +119,7 @@ class ConfigurationManager:
             user=config.user,
             password=config.password,
             pool_size=config.get('pool_size', 10),
-            charset=config.get('charset', 'utf8mb4')
+            charset=config.get('charset', 'utf8mb4'),
+            pool_timeout=config.get('pool_timeout', 5.0)
         )
         return database_config
\ No newline at end of file
@@ -1,21 +1,96 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from typing import Tuple, Optional
 import os
-from dotenv import load_dotenv
-load_dotenv()
+
+@lru_cache(maxsize=None)
+def load_env():
+    """Load .env once, on first use of a secret rather than at import time"""
+    from dotenv import load_dotenv
+    load_dotenv()
 
 @dataclass(frozen=True)
 class DataIngestionConfig:
     root_dir: Path
     query: list[str] = None
+    base_url: str = "https://newsdata.io/api/1"
+    page_size: int = 10
+    requests_per_second: float = 0.5
+    burst: int = 5
+    max_credits: int = 200
+    max_workers: int = 4
+    max_retries: int = 3
+    timeout: float = 30.0
+    mode: str = "live"                  # "live", "record" or "replay"
+    archive_path: Path = "artifacts/data_ingestion/news_archive.zip"
+    replay_latency: float = 0.0
+    replay_error_rate: float = 0.0
+    replay_seed: int = 42
+    clean_text: bool = False
+    boilerplate_patterns: list[str] = None
+
+@dataclass(frozen=True)
+class TickerTaggingConfig:
+    root_dir: Path
+    dictionary_path: Path
+    min_alias_length: int = 2
+    equity_list_path: Path = None
 
 @dataclass(frozen=True)
 class SentimentAnalysisConfig:
     model_name: str
     root_dir: Path
-    # batch_size: int = 16
+    batch_size: int = 16
     max_length: int = 512
     # device: str = 'cpu'
+    use_host_profile: bool = True
+    host_profile_dir: Path = "artifacts/sentiment/host_profiles"
+    # cascade: score title + description first, escalate to full content if unsure
+    cascade_enabled: bool = False
+    cascade_batch_size: int = 64
+    cascade_max_length: int = 128
+    cascade_confidence_threshold: float = 0.80
+    cascade_neutral_margin: float = 0.15
+    cascade_audit_rate: float = 0.05
+    cascade_audit_seed: int = 42
+
+@dataclass(frozen=True)
+class ScoringModelConfig:
+    model_name: str                     # hub id or local checkpoint path
+    name: Optional[str] = None          # key for results files and reports, defaults to model_name
+    batch_size: int = 16
+    max_length: int = 512
+    labels: Optional[Tuple[str, ...]] = None   # output order, when id2label is not positive/negative/neutral
+
+    @property
+    def key(self) -> str:
+        return self.name or self.model_name
+
+@dataclass(frozen=True)
+class ModelRegistryConfig:
+    root_dir: Path
+    models: Tuple[ScoringModelConfig, ...] = field(default_factory=tuple)
+    max_loaded_models: int = 2
+    store_in_db: bool = True
+
+@dataclass(frozen=True)
+class SentimentIndexConfig:
+    root_dir: Path
+    window: str = "3D"
+    halflife_hours: float = 24.0
+    min_articles: int = 1
+
+@dataclass(frozen=True)
+class VectorStoreConfig:
+    root_dir: Path
+    embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    batch_size: int = 32
+    max_length: int = 256
+    dtype: str = "float16"
+    nlist: int = 0                      # 0 = sqrt(number of articles)
+    nprobe: int = 8
+    brute_force_threshold: int = 20000
 
 @dataclass(frozen=True)
 class ModelTrainingConfig:
@@ -45,10 +120,12 @@ class DatabaseConfig:
     password: str
     pool_size: int = 10
     charset: str = "utf8mb4"
+    pool_timeout: float = 5.0           # seconds to wait for a free connection before giving up
 
     def __post_init__(self):
         # Replace ${ENV_VAR} with actual value
         if self.password.startswith("${") and self.password.endswith("}"):
+            load_env()
             env_var = self.password[2:-1]
             actual_password = os.getenv(env_var)
             if actual_password:
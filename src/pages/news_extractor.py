@@ -1,10 +1,100 @@
 import streamlit as st
 import pandas as pd
+import hashlib
 from datetime import datetime
 
 from config.configuration import ConfigurationManager
 from components.data_ingestion import DataIngestion
 
+PAGE_SIZES = [10, 25, 50, 100]
+FRAME_COLUMNS = ['title', 'source', 'pubDate', 'search_query', 'category', 'authors', 'url']
+
+
+def articles_key(articles) -> str:
+    """Identifies the current article set, cached views are rebuilt only when it changes"""
+    digest = hashlib.sha1(str(len(articles)).encode())
+    for article in articles:
+        digest.update(str(article.get('article_id') or article.get('link') or article.get('title')).encode())
+    return digest.hexdigest()
+
+
+# arguments starting with "_" are not hashed by st.cache_data, the article set is keyed by `key`
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_article_frame(key: str, _articles) -> pd.DataFrame:
+    """Light per-article table (no article bodies), row i is st.session_state.articles[i]"""
+    df = pd.DataFrame([{column: article.get(column) for column in FRAME_COLUMNS} for article in _articles],
+                      columns=FRAME_COLUMNS)
+    df['content_length'] = pd.Series([len(article.get('full_content') or '') or None for article in _articles],
+                                     dtype='float64')
+    return df
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_article_stats(key: str, _articles) -> dict:
+    df = build_article_frame(key, _articles)
+    words = df['title'].fillna('').str.lower().str.split().explode()
+    words = words[words.str.len() > 3]
+    return {
+        'total': len(df),
+        'unique_sources': df['source'].nunique(),
+        'avg_length': df['content_length'].mean(),
+        'latest_date': df['pubDate'].max() if df['pubDate'].notna().any() else "N/A",
+        'query_counts': df['search_query'].value_counts(),
+        'source_counts': df['source'].value_counts(),
+        'content_lengths': df['content_length'].dropna(),
+        'title_words': words.value_counts().head(10)
+    }
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def filter_rows(key: str, _articles, title_filter: str, queries: tuple):
+    """Positions of the articles matching the title filter and selected queries"""
+    df = build_article_frame(key, _articles)
+    mask = pd.Series(True, index=df.index)
+    if title_filter:
+        mask &= df['title'].fillna('').str.contains(title_filter, case=False, regex=False)
+    if queries:
+        mask &= df['search_query'].isin(queries)
+    return df.index[mask].to_numpy()
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def build_csv(key: str, _articles) -> str:
+    return pd.DataFrame(_articles).to_csv(index=False)
+
+
+def reset_page():
+    st.session_state.article_page = 1
+
+
+def show_article_card(article):
+    with st.expander(f"📰 {article.get('title', 'Untitled')}"):
+        # Add query tag if available
+        if article.get('search_query'):
+            st.markdown(f"🔍 **Found via query:** `{article['search_query']}`")
+
+        col_left, col_right = st.columns([3, 1])
+
+        with col_left:
+            st.write(f"**Description:** {article.get('description', 'No description available')}")
+
+            # Content preview
+            content = article.get('full_content', '')
+            if content:
+                preview = content[:400] + "..." if len(content) > 400 else content
+                st.write(f"**Content Preview:** {preview}")
+
+            st.write(f"**Authors:** {article.get('authors', 'Unknown')}")
+
+        with col_right:
+            st.write(f"**Source:** {article.get('source', 'Unknown')}")
+            st.write(f"**Published:** {article.get('pubDate', 'Unknown')}")
+            st.write(f"**Category:** {article.get('category', 'Business')}")
+
+            if article.get('url'):
+                st.link_button("🔗 Read Original", article['url'])
+
+
 def show():
     st.header("Financial News Extractor")
 
@@ -35,7 +125,7 @@ def show():
     # FIX: Move num_articles outside the if block and fix indentation
     # Number of articles
     num_articles = st.slider(
-        "Number of articles to extract:",
+        "Number of articles per query:",
         min_value=1,
         max_value=20,
         value=5
@@ -90,7 +180,7 @@ def show():
             # Create data ingestion instance
             try:
                 config_manager = ConfigurationManager()
-                data_ingestion = DataIngestion(config_manager)
+                data_ingestion = DataIngestion(config_manager.get_data_ingestion_config())
                 
                 # Extract articles - pass the list directly
                 articles = data_ingestion.extract_news(
@@ -101,17 +191,16 @@ def show():
                 
                 if articles:
                     st.session_state.articles = articles
+                    reset_page()
                     
                     # Show breakdown by query if multiple queries
                     if len(query_list) > 1:
-                        df = pd.DataFrame(articles)
-                        if 'search_query' in df.columns:
-                            query_breakdown = df['search_query'].value_counts()
-                            st.success(f"✅ Extracted {len(articles)} articles successfully!")
-                            
-                            with st.expander("📊 Results breakdown by query"):
-                                for query, count in query_breakdown.items():
-                                    st.write(f"• **{query}**: {count} articles")
+                        stats = build_article_stats(articles_key(articles), articles)
+                        st.success(f"✅ Extracted {len(articles)} articles successfully!")
+
+                        with st.expander("📊 Results breakdown by query"):
+                            for query, count in stats['query_counts'].items():
+                                st.write(f"• **{query}**: {count} articles")
                     else:
                         st.success(f"✅ Extracted {len(articles)} articles successfully!")
                 else:
@@ -123,111 +212,106 @@ def show():
     # Display results
     if st.session_state.articles:
         st.markdown("---")
-        
+        articles = st.session_state.articles
+        key = articles_key(articles)
+        df = build_article_frame(key, articles)
+        stats = build_article_stats(key, articles)
+
+        # Filters apply to the article list and the detailed view
+        filter_col, query_col = st.columns([2, 1])
+        with filter_col:
+            title_filter = st.text_input("Filter by title:", key="article_title_filter", on_change=reset_page)
+        with query_col:
+            queries = st.multiselect("Search queries:", options=list(stats['query_counts'].index),
+                                     key="article_query_filter", on_change=reset_page)
+        rows = filter_rows(key, articles, title_filter.strip(), tuple(queries))
+
         # Create tabs for different views
         tab1, tab2, tab3 = st.tabs(["📋 Article List", "📊 Quick Stats", "🔍 Detailed View"])
         
         with tab1:
             st.subheader("📋 Extracted Articles")
             
-            # Convert to DataFrame for easier handling
-            df = pd.DataFrame(st.session_state.articles)
-            
             # Show summary metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("📰 Total Articles", len(df))
+                st.metric("📰 Total Articles", stats['total'])
             with col2:
-                unique_sources = df['source'].nunique() if 'source' in df.columns else 0
-                st.metric("🏢 Unique Sources", unique_sources)
+                st.metric("🏢 Unique Sources", stats['unique_sources'])
             with col3:
-                if 'full_content' in df.columns and not df['full_content'].isna().all():
-                    avg_length = df['full_content'].str.len().mean()
-                    st.metric("📝 Avg Length", f"{avg_length:.0f} chars")
+                if pd.notna(stats['avg_length']):
+                    st.metric("📝 Avg Length", f"{stats['avg_length']:.0f} chars")
                 else:
                     st.metric("📝 Avg Length", "N/A")
             with col4:
-                latest_date = df['pubDate'].max() if 'pubDate' in df.columns else "N/A"
-                st.metric("📅 Latest Article", latest_date)
-            
-            # Display articles in cards
-            for idx, article in enumerate(st.session_state.articles):
-                with st.expander(f"📰 {article.get('title', 'Untitled')}"):
-                    # Add query tag if available
-                    if article.get('search_query'):
-                        st.markdown(f"🔍 **Found via query:** `{article['search_query']}`")
-                    
-                    col_left, col_right = st.columns([3, 1])
-                    
-                    with col_left:
-                        st.write(f"**Description:** {article.get('description', 'No description available')}")
-                        
-                        # Content preview
-                        content = article.get('full_content', '')
-                        if content:
-                            preview = content[:400] + "..." if len(content) > 400 else content
-                            st.write(f"**Content Preview:** {preview}")
-                        
-                        st.write(f"**Authors:** {article.get('authors', 'Unknown')}")
-                    
-                    with col_right:
-                        st.write(f"**Source:** {article.get('source', 'Unknown')}")
-                        st.write(f"**Published:** {article.get('pubDate', 'Unknown')}")
-                        st.write(f"**Category:** {article.get('category', 'Business')}")
-                        
-                        if article.get('url'):
-                            st.link_button("🔗 Read Original", article['url'])
+                st.metric("📅 Latest Article", stats['latest_date'])
+
+            # st.dataframe renders only the visible rows, so the full table stays cheap
+            st.dataframe(
+                df.iloc[rows],
+                use_container_width=True,
+                hide_index=True,
+                height=300,
+                column_config={'url': st.column_config.LinkColumn("url")}
+            )
+
+            # Article cards are built for the current page only
+            page_col, size_col = st.columns([3, 1])
+            with size_col:
+                page_size = st.selectbox("Per page:", PAGE_SIZES, index=1, key="article_page_size",
+                                         on_change=reset_page)
+            n_pages = max(1, -(-len(rows) // page_size))
+            if st.session_state.get("article_page", 1) > n_pages:
+                st.session_state.article_page = n_pages
+            with page_col:
+                page = st.number_input(f"Page (of {n_pages}):", min_value=1, max_value=n_pages,
+                                       step=1, key="article_page")
+            page_rows = rows[(page - 1) * page_size:page * page_size]
+            if len(rows):
+                st.caption(f"Showing {(page - 1) * page_size + 1}-{(page - 1) * page_size + len(page_rows)} "
+                           f"of {len(rows)} matching articles")
+            else:
+                st.info("No articles match the filters.")
+
+            for idx in page_rows:
+                show_article_card(articles[idx])
         
-        # Rest of your tabs code...
         with tab2:
             st.subheader("📊 Quick Statistics")
             
-            if len(st.session_state.articles) > 0:
-                df = pd.DataFrame(st.session_state.articles)
-                
-                # Query-wise distribution if multiple queries
-                if 'search_query' in df.columns:
-                    st.write("**Articles by Search Query:**")
-                    query_counts = df['search_query'].value_counts()
-                    st.bar_chart(query_counts)
-                
-                # Source distribution
-                if 'source' in df.columns:
-                    st.write("**Articles by Source:**")
-                    source_counts = df['source'].value_counts()
-                    st.bar_chart(source_counts)
-                
-                # Content length distribution
-                if 'full_content' in df.columns:
-                    content_lengths = df['full_content'].str.len().dropna()
-                    if not content_lengths.empty:
-                        st.write("**Content Length Distribution:**")
-                        st.bar_chart(content_lengths)
-                
-                # Word frequency in titles
+            # Query-wise distribution if multiple queries
+            if not stats['query_counts'].empty:
+                st.write("**Articles by Search Query:**")
+                st.bar_chart(stats['query_counts'])
+
+            # Source distribution
+            if not stats['source_counts'].empty:
+                st.write("**Articles by Source:**")
+                st.bar_chart(stats['source_counts'])
+
+            # Content length distribution
+            if not stats['content_lengths'].empty:
+                st.write("**Content Length Distribution:**")
+                st.bar_chart(stats['content_lengths'])
+
+            # Word frequency in titles
+            if not stats['title_words'].empty:
                 st.write("**Common Words in Titles:**")
-                all_titles = ' '.join(df['title'].fillna(''))
-                words = [word.lower() for word in all_titles.split() if len(word) > 3]
-                if words:
-                    word_freq = pd.Series(words).value_counts().head(10)
-                    st.bar_chart(word_freq)
+                st.bar_chart(stats['title_words'])
         
         with tab3:
-            # Your existing tab3 code...
             st.subheader("🔍 Detailed Article View")
             
-            if st.session_state.articles:
-                article_options = [f"{i+1}. {article.get('title', 'Untitled')[:60]}..." 
-                                for i, article in enumerate(st.session_state.articles)]
-                
+            if len(rows):
+                titles = df['title'].fillna('Untitled')
                 selected_idx = st.selectbox(
                     "Choose an article to view in detail:",
-                    range(len(article_options)),
-                    format_func=lambda x: article_options[x]
+                    rows.tolist(),
+                    format_func=lambda x: f"{x+1}. {titles.iat[x][:60]}..."
                 )
                 
                 if selected_idx is not None:
-                    article = st.session_state.articles[selected_idx]
+                    article = articles[selected_idx]
                     
                     st.markdown(f"## {article.get('title', 'Untitled')}")
                     
@@ -255,15 +339,15 @@ def show():
                                     unsafe_allow_html=True)
                     else:
                         st.warning("Full content not available")
+            else:
+                st.info("No articles match the filters.")
         
         # Download option
         st.markdown("---")
         if st.button("💾 Download Articles as CSV"):
-            df = pd.DataFrame(st.session_state.articles)
-            csv = df.to_csv(index=False)
             st.download_button(
                 label="📥 Download CSV",
-                data=csv,
+                data=build_csv(key, articles),
                 file_name=f"news_articles_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
                 mime="text/csv"
             )
@@ -7,6 +7,7 @@ sys.path.append(str(src_path))
 from config.configuration import ConfigurationManager
 from components.data_ingestion import DataIngestion
 from components.database import Database
+from components.ticker_tagging import TickerTagger
 import logging
 logger = logging.getLogger(__name__)
 
@@ -19,16 +20,25 @@ class DataIngestionPipeline:
     def main(self):
         config_manager = ConfigurationManager()
         data_ingestion_config = config_manager.get_data_ingestion_config()
+        ticker_tagging_config = config_manager.get_ticker_tagging_config()
         db_config = config_manager.get_database_config()
 
         data_ingestion = DataIngestion(config=data_ingestion_config)
         articles = data_ingestion.extract_news()
         data_ingestion.save_newsdata()
 
-        # store in database
+        tagger = TickerTagger(config=ticker_tagging_config)
+        tags = tagger.tag_articles(articles)
+        tagger.save_tags()
+
+        # store articles and their ticker tags in one transaction
         db = Database(config=db_config)
-        success, failed = db.insert_articles_batch(articles)
+        result = db.write_batch(articles, tags=tags)
+        if result is None:
+            raise RuntimeError(f"Failed to store {len(articles)} articles in the database")
+        success, failed = result
         logger.info(f"Stored {success} new articles, {failed} duplicates")
+        logger.info(f"Database pool: {db.pool_metrics()}")
         logger.info(">>> News Collection Complete <<<")
             
         return success
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent
+sys.path.append(str(src_path))
+
+from config.configuration import ConfigurationManager
+from components.model_registry import ModelRegistry
+from components.database import Database
+import pickle
+
+STAGE_NAME = "Model Comparison stage"
+
+class ModelComparisonPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        with open('artifacts/data_ingestion/news_articles.pkl', 'rb') as f:
+            news_articles = pickle.load(f)
+
+        config = ConfigurationManager()
+        model_registry_config = config.get_model_registry_config()
+        registry = ModelRegistry(config=model_registry_config)
+        registry.score(news_articles)
+        registry.save_results()
+        registry.print_report()
+
+        if model_registry_config.store_in_db:
+            database_config = config.get_database_config()
+            if database_config.enabled:
+                db = Database(config=database_config)
+                stored = registry.store_results(db)
+                failed = [key for key, ok in stored.items() if not ok]
+                if failed:
+                    raise RuntimeError(f"Failed to store results of {', '.join(failed)} in the database")
+
+if __name__ == "__main__":
+    try:
+        obj = ModelComparisonPipeline()
+        obj.main()
+    except Exception as e:
+        raise e
@@ -7,6 +7,8 @@
 
 from config.configuration import ConfigurationManager
 from components.sentiment_analysis import FinBERTSentimentAnalyzer, HybridFinancialAnalyzer
+from components.database import Database
+from mysql.connector import Error
 import pickle
 
 class SentimentAnalysisPipeline:
@@ -21,8 +23,25 @@ class SentimentAnalysisPipeline:
         sentiment_analysis_config = config.get_sentiment_analysis_config()
         FinBERTanalyzer = FinBERTSentimentAnalyzer(config=sentiment_analysis_config)
         # Hybridanalyzer = HybridFinancialAnalyzer(config=sentiment_analysis_config)
-        FinBERTanalyzer.batch_analyze(news_articles)
+        if sentiment_analysis_config.cascade_enabled:
+            FinBERTanalyzer.cascade_analyze(news_articles)
+            FinBERTanalyzer.save_cascade_report()
+        else:
+            FinBERTanalyzer.batch_analyze(news_articles)
         FinBERTanalyzer.save_sentiment_data()
+
+        # scoring needs no database: store the results only when one is configured and reachable
+        try:
+            database_config = config.get_database_config()
+            db = Database(config=database_config) if database_config.enabled else None
+        except (ValueError, Error) as e:
+            print(f"Database not available, sentiment results not stored: {e}")
+            db = None
+        if db is not None:
+            # articles first, then their sentiment rows, in one transaction
+            sentiment_rows = FinBERTanalyzer.sentiment_data.to_db_rows(sentiment_analysis_config.model_name)
+            if db.write_batch(news_articles, sentiments=sentiment_rows) is None:
+                raise RuntimeError(f"Failed to store {len(sentiment_rows)} sentiment rows in the database")
         # Hybridanalyzer.batch_analyze(news_articles)
         # Hybridanalyzer.save_sentiment_data()
 
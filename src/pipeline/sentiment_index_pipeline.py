@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent
+sys.path.append(str(src_path))
+
+from config.configuration import ConfigurationManager
+from components.sentiment_index import SentimentIndexEngine
+import pickle
+
+STAGE_NAME = "Sentiment Index stage"
+
+class SentimentIndexPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        with open('artifacts/data_ingestion/news_articles.pkl', 'rb') as f:
+            news_articles = pickle.load(f)
+        with open('artifacts/sentiment/news_sentiment.pkl', 'rb') as f:
+            sentiment_data = pickle.load(f)
+        with open('artifacts/data_ingestion/article_tickers.pkl', 'rb') as f:
+            tags = pickle.load(f)
+
+        config = ConfigurationManager()
+        sentiment_index_config = config.get_sentiment_index_config()
+        engine = SentimentIndexEngine(config=sentiment_index_config).load_state()
+        observations = engine.build_observations(news_articles, sentiment_data, tags)
+        engine.update(observations)
+        engine.save_state()
+        print(engine.screener())
+
+if __name__ == "__main__":
+    try:
+        obj = SentimentIndexPipeline()
+        obj.main()
+    except Exception as e:
+        raise e
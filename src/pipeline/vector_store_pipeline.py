@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent
+sys.path.append(str(src_path))
+
+from config.configuration import ConfigurationManager
+from components.vector_store import VectorStore
+import pickle
+import os
+
+STAGE_NAME = "Vector Store stage"
+
+class VectorStorePipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        with open('artifacts/data_ingestion/news_articles.pkl', 'rb') as f:
+            news_articles = pickle.load(f)
+        sentiment_data = None
+        if os.path.exists('artifacts/sentiment/news_sentiment.pkl'):
+            with open('artifacts/sentiment/news_sentiment.pkl', 'rb') as f:
+                sentiment_data = pickle.load(f)
+
+        config = ConfigurationManager()
+        vector_store_config = config.get_vector_store_config()
+        vector_store = VectorStore(config=vector_store_config).load()
+        vector_store.add_articles(news_articles, sentiment_data)
+        vector_store.save()
+
+if __name__ == "__main__":
+    try:
+        obj = VectorStorePipeline()
+        obj.main()
+    except Exception as e:
+        raise e
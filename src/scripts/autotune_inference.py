@@ -0,0 +1,191 @@
+"""
+Inference Autotuner
+Sweeps torch intra-op threads, interop threads, batch size and sequence length
+for FinBERT on this host, prints throughput / latency for every setting and the
+Pareto frontier, and saves the fastest setting at the configured max_length as
+the host profile that FinBERTSentimentAnalyzer applies on start-up.
+
+Each thread setting runs in its own worker process, because torch only allows
+the interop pool size to be set once per process.
+
+    python src/scripts/autotune_inference.py
+    python src/scripts/autotune_inference.py --source articles --threads 2 4 8 --batch-sizes 8 16 32
+    python src/scripts/autotune_inference.py --latency-budget 2000 --dry-run
+"""
+
+import sys
+import argparse
+import csv
+import json
+import os
+import pickle
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent
+sys.path.append(str(src_path))
+# config paths (artifacts/..., ../data) are relative to src, as for the pipelines
+os.chdir(src_path)
+
+from config.configuration import ConfigurationManager
+from components.host_profile import apply_thread_settings, save_host_profile, host_key
+
+
+def load_texts(source: str, samples: int, sentences_per_text: int):
+    """Sample texts to score: article bodies, or all-data.csv sentences joined into article-length texts"""
+    if source == 'articles':
+        config = ConfigurationManager().get_data_ingestion_config()
+        with open(os.path.join(config.root_dir, 'news_articles.pkl'), 'rb') as f:
+            articles = pickle.load(f)
+        texts = [article.get('full_content') or article.get('description') or '' for article in articles]
+        texts = [text for text in texts if text]
+    else:
+        with open(src_path.parent / 'data' / 'all-data.csv', encoding='latin-1', newline='') as f:
+            sentences = [row[1] for row in csv.reader(f) if len(row) > 1]
+        texts = [' '.join(sentences[start:start + sentences_per_text])
+                 for start in range(0, len(sentences), sentences_per_text)]
+    if not texts:
+        raise ValueError(f"No texts found for source '{source}'")
+    # repeat short sources so every setting scores the same number of texts
+    return (texts * (samples // len(texts) + 1))[:samples]
+
+
+def run_worker(args):
+    """Benchmark every batch size x max_length for one thread setting, one JSON line per result"""
+    apply_thread_settings(args.threads[0], args.interop_threads[0])
+    from components.sentiment_analysis import FinBERTSentimentAnalyzer
+
+    config = replace(ConfigurationManager().get_sentiment_analysis_config(), use_host_profile=False)
+    if args.model_name:
+        config = replace(config, model_name=args.model_name)
+    analyzer = FinBERTSentimentAnalyzer(config)
+    with open(args.texts_file) as f:
+        texts = json.load(f)
+
+    analyzer._predict(texts[:args.batch_sizes[0]], args.max_lengths[0], args.batch_sizes[0])  # warm-up
+    for max_length in args.max_lengths:
+        for batch_size in args.batch_sizes:
+            latencies = []
+            start = time.perf_counter()
+            for offset in range(0, len(texts), batch_size):
+                batch_start = time.perf_counter()
+                analyzer._predict(texts[offset:offset + batch_size], max_length, batch_size)
+                latencies.append(time.perf_counter() - batch_start)
+            elapsed = time.perf_counter() - start
+            print(json.dumps({
+                'num_threads': args.threads[0],
+                'interop_threads': args.interop_threads[0],
+                'batch_size': batch_size,
+                'max_length': max_length,
+                'throughput': len(texts) / elapsed,
+                'p50_batch_ms': 1000 * statistics.median(latencies),
+                'max_batch_ms': 1000 * max(latencies)
+            }), flush=True)
+
+
+def pareto_frontier(results):
+    """Settings no other setting beats on both throughput and p50 batch latency"""
+    frontier = []
+    for result in sorted(results, key=lambda r: (r['p50_batch_ms'], -r['throughput'])):
+        if not frontier or result['throughput'] > frontier[-1]['throughput']:
+            frontier.append(result)
+    return frontier
+
+
+def print_results(title, results):
+    print(f"\n{title}")
+    print(f"{'threads':>8} {'interop':>8} {'batch':>6} {'max_len':>8} {'texts/s':>9} {'p50 ms':>9} {'max ms':>9}")
+    for r in results:
+        print(f"{r['num_threads']:>8} {r['interop_threads']:>8} {r['batch_size']:>6} {r['max_length']:>8} "
+              f"{r['throughput']:>9.1f} {r['p50_batch_ms']:>9.1f} {r['max_batch_ms']:>9.1f}")
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--source', choices=['all-data', 'articles'], default='all-data')
+    parser.add_argument('--samples', type=int, default=128, help='texts scored per setting')
+    parser.add_argument('--sentences-per-text', type=int, default=20,
+                        help='all-data.csv sentences joined into one article-length text')
+    parser.add_argument('--threads', type=int, nargs='+',
+                        default=sorted({t for t in (1, 2, 4, 8, 16, cpus // 2, cpus) if 1 <= t <= cpus}))
+    parser.add_argument('--interop-threads', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    parser.add_argument('--max-lengths', type=int, nargs='+', default=None,
+                        help='defaults to 128, 256 and the configured max_length')
+    parser.add_argument('--latency-budget', type=float, default=None,
+                        help='only pick settings whose p50 batch latency (ms) is within this budget')
+    parser.add_argument('--model-name', default=None, help='override sentiment_analysis.model_name')
+    parser.add_argument('--dry-run', action='store_true', help='report only, do not save the host profile')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--texts-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    config = ConfigurationManager().get_sentiment_analysis_config()
+    if args.model_name:
+        # the profile is saved under (and only applied to) the model that was tuned
+        config = replace(config, model_name=args.model_name)
+    max_lengths = args.max_lengths or sorted({128, 256, config.max_length})
+    texts = load_texts(args.source, args.samples, args.sentences_per_text)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        texts_file = os.path.join(tmp_dir, 'texts.json')
+        with open(texts_file, 'w') as f:
+            json.dump(texts, f)
+        for num_threads in args.threads:
+            for interop_threads in args.interop_threads:
+                print(f"Benchmarking {num_threads} threads, {interop_threads} interop threads ...", flush=True)
+                command = [sys.executable, __file__, '--worker', '--texts-file', texts_file,
+                           '--threads', str(num_threads), '--interop-threads', str(interop_threads),
+                           '--batch-sizes', *map(str, args.batch_sizes),
+                           '--max-lengths', *map(str, max_lengths)]
+                if args.model_name:
+                    command += ['--model-name', args.model_name]
+                worker = subprocess.run(command, capture_output=True, text=True)
+                if worker.returncode != 0:
+                    print(f"  worker failed: {worker.stderr.strip().splitlines()[-1]}")
+                    continue
+                results += [json.loads(line) for line in worker.stdout.splitlines() if line.startswith('{')]
+
+    if not results:
+        raise RuntimeError("No benchmark results, every worker failed")
+    print_results(f"All settings ({len(texts)} texts each, host {host_key()})",
+                  sorted(results, key=lambda r: -r['throughput']))
+    print_results("Throughput / latency frontier", pareto_frontier(results))
+
+    candidates = [r for r in results if r['max_length'] == config.max_length] or results
+    if args.latency_budget is not None:
+        within_budget = [r for r in candidates if r['p50_batch_ms'] <= args.latency_budget]
+        if not within_budget:
+            print(f"\nNo setting meets the {args.latency_budget:.0f} ms budget, using the lowest latency one")
+            within_budget = [min(candidates, key=lambda r: r['p50_batch_ms'])]
+        candidates = within_budget
+    best = max(candidates, key=lambda r: r['throughput'])
+    print_results("Selected", [best])
+
+    if args.dry_run:
+        return
+    if best['max_length'] != config.max_length:
+        # load_host_profile ignores profiles tuned for another max_length
+        print(f"\nNot saving a host profile: no results at the configured max_length {config.max_length}")
+        return
+    path = save_host_profile(config, {
+        'model_name': config.model_name,
+        'source': args.source,
+        'tuned_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        **best
+    })
+    print(f"\nSaved host profile to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Import Time Benchmark
+Imports each entry point in a fresh interpreter with `python -X importtime`
+and reports its cumulative import time, the slowest packages it pulls in and
+whether heavy dependencies (torch, transformers, LangChain, ...) were loaded.
+
+    python src/scripts/benchmark_import_time.py
+    python src/scripts/benchmark_import_time.py pipeline.data_ingestion_pipeline --top 15
+"""
+
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent
+
+ENTRY_POINTS = [
+    'config_entity',
+    'config.configuration',
+    'components.data_ingestion',
+    'components.sentiment_analysis',
+    'pipeline.data_ingestion_pipeline',
+    'pipeline.sentiment_analysis_pipeline',
+    'pages.news_extractor',
+    'pages.sentiment',
+]
+
+HEAVY_PACKAGES = ['torch', 'transformers', 'langchain_core', 'langchain_ollama',
+                  'newspaper', 'newsdataapi', 'plotly', 'mysql', 'pandas', 'streamlit']
+
+
+def profile(module: str, repeats: int):
+    """Best-of-`repeats` cumulative import time (ms), per-package times and heavy packages loaded"""
+    best = None
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=src_path, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None, {}, [], result.stderr.strip().splitlines()[-1]
+        packages = {}
+        total_us = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, raw_name = line[len('import time:'):].split('|')
+            name = raw_name.strip()
+            # nesting is shown by two extra spaces per level; top-level entries sum to the whole import
+            if len(raw_name) - len(raw_name.lstrip()) == 1:
+                total_us += int(cumulative)
+            packages[name] = max(packages.get(name, 0), int(cumulative))
+        if best is None or total_us < best[0]:
+            best = (total_us, packages)
+    total_us, packages = best
+    heavy = [name for name in HEAVY_PACKAGES if name in packages]
+    return total_us / 1000, packages, heavy, None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('modules', nargs='*', default=ENTRY_POINTS)
+    parser.add_argument('--top', type=int, default=5, help='slowest packages to list per module')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        total_ms, packages, heavy, error = profile(module, args.repeats)
+        if error:
+            print(f"{module:<40} failed: {error}")
+            continue
+        print(f"{module:<40} {total_ms:8.1f} ms   heavy: {', '.join(heavy) or '-'}")
+        top_level = {name: us for name, us in packages.items() if '.' not in name and name != module}
+        for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"{'':<44}{us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Ingestion Replay Benchmark
+Times DataIngestion.extract_news offline against a recorded NewsArchive, with
+configurable latency and error injection, so ingestion changes can be compared
+reproducibly without NewsData.io or publisher sites.
+
+Replay an archive recorded from real runs (data_ingestion.mode: "record"):
+    python src/scripts/benchmark_ingestion_replay.py --archive artifacts/data_ingestion/news_archive.zip \
+        --queries HDFC SBI --limit 10
+
+Or record a synthetic archive from the local NewsData stand-in first:
+    python src/scripts/benchmark_ingestion_replay.py --synthetic --latency 0.05 --error-rate 0.05
+"""
+
+import sys
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent
+sys.path.append(str(src_path))
+
+from config_entity import DataIngestionConfig
+from components.data_ingestion import DataIngestion
+from utils.newsdata_standin import NewsDataStandIn
+
+
+def record_synthetic(config: DataIngestionConfig, queries, limit):
+    server = NewsDataStandIn(rate_limit=1000, burst=100).start()
+    try:
+        recorder = DataIngestion(replace(config, mode="record", base_url=server.base_url))
+        recorder.extract_news(query=queries, limit=limit)
+    finally:
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--archive', help='recorded archive to replay')
+    parser.add_argument('--synthetic', action='store_true', help='record a synthetic archive first')
+    parser.add_argument('--queries', nargs='+', default=['HDFC', 'SBI', 'ICICI Bank', 'Axis Bank'])
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=42, help='error injection seed, the same errors every run')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive_path = args.archive or os.path.join(tmp_dir, 'news_archive.zip')
+        config = DataIngestionConfig(
+            root_dir=tmp_dir,
+            archive_path=archive_path,
+            requests_per_second=1000,
+            burst=100,
+            max_retries=5,
+            replay_latency=args.latency,
+            replay_error_rate=args.error_rate,
+            replay_seed=args.seed,
+        )
+        if args.synthetic:
+            record_synthetic(config, args.queries, args.limit)
+        elif not args.archive:
+            parser.error("pass --archive or --synthetic")
+
+        timings, counts = [], []
+        for _ in range(args.runs):
+            ingestion = DataIngestion(replace(config, mode="replay"))
+            start = time.perf_counter()
+            articles = ingestion.extract_news(query=args.queries, limit=args.limit)
+            timings.append(time.perf_counter() - start)
+            counts.append(len(articles))
+
+        if len(set(counts)) > 1:
+            print(f"Warning: runs returned different article counts {counts}")
+        print(f"Replayed {statistics.mean(counts):.0f} articles per run over {args.runs} runs: "
+              f"median {statistics.median(timings):.2f} s, "
+              f"{statistics.mean(counts) / statistics.median(timings):.1f} articles/s")
+
+
+if __name__ == '__main__':
+    main()
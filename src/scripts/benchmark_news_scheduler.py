@@ -0,0 +1,52 @@
+"""
+News Fetch Scheduler Check
+Runs NewsFetchScheduler against the local NewsData stand-in and reports
+pagination, dedup, rate-limit and credit behaviour.
+
+    python src/scripts/benchmark_news_scheduler.py --limit 30
+"""
+
+import sys
+import argparse
+from collections import Counter
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent
+sys.path.append(str(src_path))
+
+from config_entity import DataIngestionConfig
+from components.news_scheduler import NewsFetchScheduler
+from utils.newsdata_standin import NewsDataStandIn
+
+BANKING_SECTOR = ['HDFC', 'SBI', 'ICICI Bank', 'Axis Bank']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--limit', type=int, default=30, help='articles per query')
+    parser.add_argument('--rate', type=float, default=10.0, help='client requests per second')
+    parser.add_argument('--server-rate', type=float, default=8.0, help='stand-in requests per second')
+    parser.add_argument('--credits', type=int, default=200)
+    args = parser.parse_args()
+
+    server = NewsDataStandIn(rate_limit=args.server_rate, burst=4, latency=0.05).start()
+    try:
+        config = DataIngestionConfig(
+            root_dir='artifacts/data_ingestion',
+            base_url=server.base_url,
+            requests_per_second=args.rate,
+            burst=4,
+            max_credits=args.credits,
+        )
+        scheduler = NewsFetchScheduler(config)
+        articles = scheduler.fetch(BANKING_SECTOR, limit=args.limit)
+
+        print(f"Articles per query: {dict(Counter(a['search_query'] for a in articles))}")
+        print(f"Stand-in served {server.requests_served} requests, "
+              f"rejected {server.rate_limited} with 429")
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
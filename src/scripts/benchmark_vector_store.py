@@ -0,0 +1,138 @@
+"""
+Vector Store Benchmark
+Fills a scratch vector store with clustered unit vectors (topics, like real
+article embeddings; uniform random vectors have no neighbourhoods for an IVF
+index to find) and times similar-article queries, with and without metadata
+filters, at each nprobe. Recall@k is measured against an exact scan, and the
+smallest nprobe reaching --target-recall on every case is reported.
+
+    python src/scripts/benchmark_vector_store.py --articles 1000000
+    python src/scripts/benchmark_vector_store.py --articles 200000 --nprobe 8 16 32 --clusters 500
+"""
+
+import sys
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).parent.parent
+sys.path.append(str(src_path))
+
+from config_entity import VectorStoreConfig
+from components.vector_store import VectorStore, EmbeddingCache, IVFIndex
+
+
+def exact_neighbours(store: VectorStore, rows: np.ndarray, k: int, masks: dict, chunk: int = 100_000):
+    """Exact top-k rows for every query row (itself excluded) under each filter mask, by a full scan"""
+    vectors = store.cache.vectors
+    queries = np.asarray(vectors[rows], dtype=np.float32)
+    best = {name: (np.empty((len(rows), 0), np.float32), np.empty((len(rows), 0), np.int64)) for name in masks}
+    for start in range(0, len(vectors), chunk):
+        block = np.asarray(vectors[start:start + chunk], dtype=np.float32)
+        block_rows = np.arange(start, start + len(block))
+        scores = queries @ block.T
+        scores[rows[:, None] == block_rows[None, :]] = -np.inf
+        for name, mask in masks.items():
+            masked = scores if mask is None else np.where(mask[block_rows], scores, -np.inf)
+            all_scores = np.concatenate([best[name][0], masked], axis=1)
+            all_rows = np.concatenate([best[name][1], np.broadcast_to(block_rows, masked.shape)], axis=1)
+            top = np.argpartition(-all_scores, min(k, all_scores.shape[1]) - 1, axis=1)[:, :k]
+            best[name] = (np.take_along_axis(all_scores, top, axis=1), np.take_along_axis(all_rows, top, axis=1))
+    return {name: [set(found[score > -np.inf]) for score, found in zip(*best[name])] for name in masks}
+
+
+def clustered_vectors(rng, centers: np.ndarray, n: int, spread: float) -> np.ndarray:
+    """Unit vectors scattered around random topic centres; spread is the noise norm relative to a centre"""
+    dim = centers.shape[1]
+    vectors = centers[rng.integers(0, len(centers), n)]
+    vectors += rng.standard_normal((n, dim), dtype=np.float32) * (spread / np.sqrt(dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=1_000_000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--clusters', type=int, default=2000, help='topics the vectors are drawn around')
+    parser.add_argument('--spread', type=float, default=1.0, help='noise around a topic, relative to its norm')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[4, 8, 16, 32, 64])
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--target-recall', type=float, default=0.9)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as root_dir:
+        config = VectorStoreConfig(root_dir=root_dir)
+        store = VectorStore(config)
+        store.cache = EmbeddingCache(root_dir, args.dim, config.dtype)
+
+        start = time.time()
+        centers = rng.standard_normal((args.clusters, args.dim), dtype=np.float32)
+        centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+        chunk = 100_000
+        for offset in range(0, args.articles, chunk):
+            n = min(chunk, args.articles - offset)
+            store.cache.add([f"a{offset + i}" for i in range(n)], clustered_vectors(rng, centers, n, args.spread))
+        store.sentiment = rng.integers(0, 3, args.articles).astype(np.int8)
+        store.sources = {f"source_{i}": i for i in range(50)}
+        store.source = rng.integers(0, 50, args.articles).astype(np.int32)
+        store.pub_date = (np.datetime64('2025-01-01T00:00:00')
+                          + rng.integers(0, 365 * 86400, args.articles).astype('timedelta64[s]'))
+        print(f"Filled {args.articles} vectors around {args.clusters} topics in {time.time() - start:.1f} s")
+
+        start = time.time()
+        store.index = IVFIndex(nlist=config.nlist)
+        store.index.train(store.cache.vectors)
+        print(f"Trained IVF index ({store.index.nlist} cells) in {time.time() - start:.1f} s")
+
+        rows = rng.integers(0, args.articles, args.queries)
+        ids = [store.cache.ids[row] for row in rows]
+        cases = {
+            'unfiltered': {},
+            'sentiment=positive': {'sentiment': 'positive'},
+            'source + date range': {'source': 'source_7', 'start_date': '2025-03-01',
+                                    'end_date': '2025-06-30'},
+        }
+        start = time.time()
+        exact = exact_neighbours(store, rows, args.k,
+                                 {name: store._filter_mask(**filters) for name, filters in cases.items()})
+        print(f"Exact scan of {args.queries} queries in {time.time() - start:.1f} s")
+
+        chosen = None
+        for nprobe in sorted(args.nprobe):
+            store.index.nprobe = nprobe
+            print(f"\nnprobe {min(nprobe, store.index.nlist)} of {store.index.nlist} cells")
+            recalls_at_nprobe = []
+            for name, filters in cases.items():
+                latencies, recalls, short = [], [], 0
+                for article_id, expected in zip(ids, exact[name]):
+                    t0 = time.perf_counter()
+                    results = store.similar_articles(article_id, k=args.k, **filters)
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                    found = {store.cache.id_to_row[result['article_id']] for result in results}
+                    short += len(found) < len(expected)
+                    if expected:
+                        recalls.append(len(found & expected) / len(expected))
+                recall = np.mean(recalls) if recalls else 0.0
+                recalls_at_nprobe.append(recall)
+                latencies = np.array(latencies)
+                print(f"{name:>22}: p50 {np.percentile(latencies, 50):.2f} ms, "
+                      f"p95 {np.percentile(latencies, 95):.2f} ms, recall@{args.k} {recall:.3f}"
+                      + (f", {short} queries short of k" if short else ""))
+            if chosen is None and min(recalls_at_nprobe) >= args.target_recall:
+                chosen = nprobe
+
+        if chosen is None:
+            print(f"\nNo nprobe in {sorted(args.nprobe)} reaches recall@{args.k} {args.target_recall}")
+        else:
+            print(f"\nSmallest nprobe with recall@{args.k} >= {args.target_recall} on every case: {chosen} "
+                  f"(vector_store.nprobe is {config.nprobe})")
+
+
+if __name__ == '__main__':
+    main()
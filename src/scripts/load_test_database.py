@@ -0,0 +1,202 @@
+"""
+Database Write Load Test
+Runs concurrent writers against Database.write_batch (articles, ticker tags and
+sentiment rows in one transaction, prepared multi-row INSERTs) and reports
+sustained insert throughput and connection pool metrics. Uses the local
+MySQL-compatible stand-in unless --host is given; --compare also runs the old
+row-at-a-time path (text protocol, one INSERT per row) on the same setup.
+
+    python src/scripts/load_test_database.py --writers 8 --pool-size 5 --duration 20
+    python src/scripts/load_test_database.py --latency 0.0005 --compare
+    python src/scripts/load_test_database.py --host 127.0.0.1 --port 3306 --user finews_user --password ...
+"""
+
+import sys
+import argparse
+import random
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent
+sys.path.append(str(src_path))
+
+from config_entity import DatabaseConfig
+from components.database import Database, ARTICLES_INSERT, TICKERS_INSERT, SENTIMENT_INSERT
+from scripts.setup_database import TABLES
+from utils.mysql_standin import MySQLStandIn
+
+LABELS = ("positive", "negative", "neutral")
+SYMBOLS = ["HDFCBANK", "SBIN", "ICICIBANK", "RELIANCE", "TCS", "INFY", "ITC", "LT"]
+
+
+def make_batch(rng: random.Random, writer: int, batch: int, size: int, duplicate_rate: float):
+    """Synthetic articles with one sentiment row and 0-2 ticker tags each"""
+    articles, sentiments, tags = [], [], []
+    published = datetime(2025, 1, 1) + timedelta(minutes=batch)
+    for i in range(size):
+        if batch and rng.random() < duplicate_rate:
+            article_id = f"w{writer}-b{rng.randrange(batch)}-{i}"       # already written by this writer
+        else:
+            article_id = f"w{writer}-b{batch}-{i}"
+        articles.append({
+            'article_id': article_id,
+            'title': f"Markets update {article_id}",
+            'description': "Synthetic description for the database load test.",
+            'full_content': "Synthetic article body. " * rng.randint(20, 80),
+            'source_name': f"source{rng.randrange(20)}",
+            'pubDate': published.strftime('%Y-%m-%d %H:%M:%S'),
+            'link': f"https://example.com/{article_id}",
+            'category': ['business'],
+            'country': ['india'],
+        })
+        scores = [rng.random() for _ in LABELS]
+        total = sum(scores)
+        scores = [score / total for score in scores]
+        best = max(range(len(LABELS)), key=lambda j: scores[j])
+        sentiments.append({
+            'article_id': article_id, 'model_name': 'finbert', 'sentiment': LABELS[best],
+            'confidence': scores[best], 'positive_score': scores[0], 'negative_score': scores[1],
+            'neutral_score': scores[2], 'processing_time_ms': rng.uniform(5, 50)
+        })
+        for symbol in rng.sample(SYMBOLS, rng.randint(0, 2)):
+            tags.append({'article_id': article_id, 'symbol': symbol, 'exchange': 'NSE',
+                         'mention_count': rng.randint(1, 4), 'in_title': rng.random() < 0.3})
+    return articles, sentiments, tags
+
+
+def legacy_write(db: Database, articles, sentiments, tags):
+    """Old write path: plain cursor, one INSERT per row, each table committed on its own"""
+    connection = db.get_connection()
+    if not connection:
+        return (0, len(articles))
+    cursor = connection.cursor()
+    inserted = 0
+    try:
+        for statement, rows in ((ARTICLES_INSERT, [db._article_row(a) for a in articles]),
+                                (TICKERS_INSERT, [db._ticker_row(t) for t in tags]),
+                                (SENTIMENT_INSERT, [db._sentiment_row(s) for s in sentiments])):
+            head, width, tail = statement
+            query = f"{head} VALUES ({', '.join(['%s'] * width)}) {tail}"
+            for row in rows:
+                cursor.execute(query, row)
+                if statement is ARTICLES_INSERT:
+                    inserted += cursor.rowcount
+            connection.commit()
+    finally:
+        cursor.close()
+        db.release_connection(connection)
+    return (inserted, len(articles) - inserted)
+
+
+def run(db: Database, args, write, label: str, writer_offset: int):
+    counts = {'articles': 0, 'failed': 0, 'rows': 0, 'batches': 0}
+    timeline = []
+    lock = threading.Lock()
+    stop = time.time() + args.duration
+
+    def writer(index):
+        rng = random.Random(index)
+        batch = 0
+        while time.time() < stop:
+            articles, sentiments, tags = make_batch(rng, writer_offset + index, batch, args.batch_size,
+                                                    args.duplicate_rate)
+            inserted, failed = write(db, articles, sentiments, tags) or (0, len(articles))
+            batch += 1
+            with lock:
+                counts['articles'] += inserted
+                counts['failed'] += failed
+                counts['rows'] += len(articles) + len(sentiments) + len(tags)
+                counts['batches'] += 1
+
+    def sampler():
+        last = 0
+        while time.time() < stop:
+            time.sleep(1.0)
+            with lock:
+                rows = counts['rows']
+            timeline.append((rows - last, db.pool_metrics()['in_use']))
+            last = rows
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    threads.append(threading.Thread(target=sampler))
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    per_second = [rows for rows, _ in timeline] or [0]
+    print(f"\n{label}: {counts['batches']} batches of {args.batch_size} articles in {elapsed:.1f}s")
+    print(f"  articles inserted {counts['articles']}, failed/duplicate {counts['failed']}")
+    print(f"  rows written      {counts['rows'] / elapsed:10.0f} rows/s   "
+          f"(per second: min {min(per_second)}, median {statistics.median(per_second):.0f}, max {max(per_second)})")
+    print(f"  pool in use       {statistics.mean(in_use for _, in_use in timeline) if timeline else 0:.1f} avg "
+          f"of {db.pool_metrics()['pool_size']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', help='real MySQL server, default is a local stand-in')
+    parser.add_argument('--port', type=int, default=3306)
+    parser.add_argument('--user', default='finews_user')
+    parser.add_argument('--password', default='standin')
+    parser.add_argument('--database', default='financial_news')
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--pool-size', type=int, default=5)
+    parser.add_argument('--pool-timeout', type=float, default=30.0)
+    parser.add_argument('--batch-size', type=int, default=200, help='articles per transaction')
+    parser.add_argument('--duplicate-rate', type=float, default=0.05)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per run')
+    parser.add_argument('--latency', type=float, default=0.0, help='stand-in delay per command (network RTT)')
+    parser.add_argument('--compare', action='store_true', help='also run the row-at-a-time path')
+    args = parser.parse_args()
+
+    server = None
+    if not args.host:
+        server = MySQLStandIn(database=args.database, latency=args.latency).start()
+        args.host, args.port = server.host, server.port
+    try:
+        config = DatabaseConfig(enabled=True, type="mysql", host=args.host, port=args.port,
+                                database=args.database, user=args.user, password=args.password,
+                                pool_size=args.pool_size, pool_timeout=args.pool_timeout)
+        db = Database(config=config)
+        connection = db.get_connection()
+        cursor = connection.cursor()
+        for ddl in TABLES.values():
+            cursor.execute(ddl)
+        connection.commit()
+        cursor.close()
+        db.release_connection(connection)
+
+        print(f"{args.writers} writers, pool of {args.pool_size}, "
+              f"{'stand-in' if server else args.host}{f' with {args.latency * 1000:.2f} ms latency' if args.latency else ''}")
+        stats_before = dict(server.stats) if server else {}
+        run(db, args, Database.write_batch, "Prepared, one transaction per batch", 0)
+        if server:
+            print(f"  statements prepared {server.stats['prepares'] - stats_before['prepares']}, "
+                  f"executed {server.stats['executes'] - stats_before['executes']}")
+        if args.compare:
+            run(db, args, legacy_write, "Row at a time (previous path)", args.writers)
+
+        print("\nPool metrics")
+        for key, value in db.pool_metrics().items():
+            print(f"  {key:<18} {value:.2f}" if isinstance(value, float) else f"  {key:<18} {value}")
+
+        connection = db.get_connection()
+        cursor = connection.cursor()
+        for table in TABLES:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            print(f"  rows in {table:<11} {cursor.fetchone()[0]}")
+        cursor.close()
+        db.release_connection(connection)
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
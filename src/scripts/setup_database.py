@@ -13,6 +13,61 @@ from config_entity import DatabaseConfig
 
 logger = logging.getLogger(__name__)
 
+# in dependency order: sentiment_analysis and article_tickers reference news_articles
+TABLES = {
+    'news_articles': """
+        CREATE TABLE IF NOT EXISTS news_articles (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            article_id VARCHAR(255) UNIQUE NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            content TEXT,
+            source VARCHAR(255),
+            published_date DATETIME NOT NULL,
+            url TEXT,
+            category VARCHAR(100),
+            country VARCHAR(10),
+            language VARCHAR(10),
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_published_date (published_date),
+            INDEX idx_source (source),
+            INDEX idx_category (category)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'sentiment_analysis': """
+        CREATE TABLE IF NOT EXISTS sentiment_analysis (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            article_id VARCHAR(255) NOT NULL,
+            model_name VARCHAR(100) NOT NULL,
+            sentiment VARCHAR(50) NOT NULL,
+            confidence FLOAT,
+            positive_score FLOAT,
+            negative_score FLOAT,
+            neutral_score FLOAT,
+            analyzed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            processing_time_ms FLOAT,
+            FOREIGN KEY (article_id) REFERENCES news_articles(article_id)
+                ON DELETE CASCADE,
+            INDEX idx_article_id (article_id),
+            INDEX idx_model_name (model_name),
+            INDEX idx_sentiment (sentiment),
+            UNIQUE KEY unique_article_model (article_id, model_name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'article_tickers': """
+        CREATE TABLE IF NOT EXISTS article_tickers (
+            article_id VARCHAR(255) NOT NULL,
+            symbol VARCHAR(32) NOT NULL,
+            exchange VARCHAR(8) NOT NULL DEFAULT 'NSE',
+            mention_count INT NOT NULL DEFAULT 1,
+            in_title BOOLEAN NOT NULL DEFAULT FALSE,
+            PRIMARY KEY (article_id, symbol),
+            INDEX idx_symbol (symbol),
+            FOREIGN KEY (article_id) REFERENCES news_articles(article_id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+}
+
 class Database:
     def __init__(self, config=DatabaseConfig):
         self.config = config
@@ -43,7 +98,21 @@ class Database:
         except Error as e:
             logger.error(f"Error getting connection: {e}")
             return None
-        
-    
 
-    
\ No newline at end of file
+    def create_tables(self):
+        connection = self.get_connection()
+        if not connection:
+            return False
+        try:
+            cursor = connection.cursor()
+            for table_name, ddl in TABLES.items():
+                cursor.execute(ddl)
+                logger.info(f"Table ready: {table_name}")
+            connection.commit()
+            return True
+        except Error as e:
+            logger.error(f"Create tables error: {e}")
+            return False
+        finally:
+            cursor.close()
+            connection.close()
@@ -0,0 +1,472 @@
+"""
+Local MySQL-compatible stand-in backed by SQLite.
+MySQLStandIn speaks enough of the MySQL client/server protocol for
+mysql-connector-python (handshake, text queries, prepared statements,
+transactions and the COM_RESET_CONNECTION sent by pooled connections) to run
+Database's write path and its load test without a MySQL server. MySQL DDL,
+INSERT IGNORE and ON DUPLICATE KEY UPDATE are translated to SQLite; anything
+else is passed through, so this is not a general MySQL emulator.
+"""
+
+import os
+import random
+import re
+import shutil
+import socketserver
+import sqlite3
+import string
+import struct
+import tempfile
+import threading
+import time
+
+CLIENT_LONG_PASSWORD = 0x00000001
+CLIENT_LONG_FLAG = 0x00000004
+CLIENT_CONNECT_WITH_DB = 0x00000008
+CLIENT_PROTOCOL_41 = 0x00000200
+CLIENT_TRANSACTIONS = 0x00002000
+CLIENT_SECURE_CONNECTION = 0x00008000
+CLIENT_MULTI_RESULTS = 0x00020000
+CLIENT_PS_MULTI_RESULTS = 0x00040000
+CLIENT_PLUGIN_AUTH = 0x00080000
+CLIENT_CONNECT_ATTRS = 0x00100000
+CLIENT_PLUGIN_AUTH_LENENC_CLIENT_DATA = 0x00200000
+SERVER_CAPABILITIES = (
+    CLIENT_LONG_PASSWORD | CLIENT_LONG_FLAG | CLIENT_CONNECT_WITH_DB | CLIENT_PROTOCOL_41
+    | CLIENT_TRANSACTIONS | CLIENT_SECURE_CONNECTION | CLIENT_MULTI_RESULTS | CLIENT_PS_MULTI_RESULTS
+    | CLIENT_PLUGIN_AUTH | CLIENT_CONNECT_ATTRS | CLIENT_PLUGIN_AUTH_LENENC_CLIENT_DATA
+)
+
+STATUS_IN_TRANS = 0x0001
+STATUS_AUTOCOMMIT = 0x0002
+
+COM_QUIT = 0x01
+COM_INIT_DB = 0x02
+COM_QUERY = 0x03
+COM_PING = 0x0e
+COM_CHANGE_USER = 0x11
+COM_STMT_PREPARE = 0x16
+COM_STMT_EXECUTE = 0x17
+COM_STMT_CLOSE = 0x19
+COM_STMT_RESET = 0x1a
+COM_RESET_CONNECTION = 0x1f
+
+TYPE_TINY, TYPE_SHORT, TYPE_LONG, TYPE_FLOAT, TYPE_DOUBLE, TYPE_NULL = 0x01, 0x02, 0x03, 0x04, 0x05, 0x06
+TYPE_TIMESTAMP, TYPE_LONGLONG, TYPE_INT24, TYPE_DATE, TYPE_TIME, TYPE_DATETIME = 0x07, 0x08, 0x09, 0x0a, 0x0b, 0x0c
+TYPE_YEAR, TYPE_VAR_STRING = 0x0d, 0xfd
+
+MAX_PACKET = 0xffffff
+SERVER_VERSION = "8.0.36-standin"
+
+# sqlite error message -> (MySQL error code, SQLSTATE)
+SQLITE_ERRORS = [
+    ("UNIQUE constraint failed", 1062, "23000"),
+    ("FOREIGN KEY constraint failed", 1452, "23000"),
+    ("NOT NULL constraint failed", 1048, "23000"),
+    ("no such table", 1146, "42S02"),
+    ("database is locked", 1205, "HY000"),
+]
+
+
+def _lenenc_int(value: int) -> bytes:
+    if value < 251:
+        return bytes([value])
+    if value < 1 << 16:
+        return b"\xfc" + struct.pack("<H", value)
+    if value < 1 << 24:
+        return b"\xfd" + struct.pack("<I", value)[:3]
+    return b"\xfe" + struct.pack("<Q", value)
+
+
+def _lenenc_str(value) -> bytes:
+    if not isinstance(value, bytes):
+        value = str(value).encode("utf-8")
+    return _lenenc_int(len(value)) + value
+
+
+def _read_lenenc_int(data: bytes, pos: int):
+    first = data[pos]
+    if first < 251:
+        return first, pos + 1
+    if first == 0xfc:
+        return struct.unpack_from("<H", data, pos + 1)[0], pos + 3
+    if first == 0xfd:
+        return int.from_bytes(data[pos + 1:pos + 4], "little"), pos + 4
+    return struct.unpack_from("<Q", data, pos + 1)[0], pos + 9
+
+
+_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"|`[^`]*`", re.S)
+_ESCAPES = {"0": "\0", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a", "b": "\b"}
+
+
+def _unescape(body: str, quote: str) -> str:
+    body = body.replace(quote * 2, quote)
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(1)), body, flags=re.S)
+
+
+def _mask_literals(sql: str):
+    """Replace string literals with placeholders so rewrites only see SQL keywords"""
+    literals = []
+
+    def mask(match):
+        token = match.group(0)
+        if token[0] == "`":
+            literals.append('"' + token[1:-1] + '"')
+        else:
+            literals.append("'" + _unescape(token[1:-1], token[0]).replace("'", "''") + "'")
+        return f"\x00{len(literals) - 1}\x00"
+
+    return _LITERAL.sub(mask, sql), literals
+
+
+def _unmask_literals(sql: str, literals) -> str:
+    return re.sub(r"\x00(\d+)\x00", lambda m: literals[int(m.group(1))], sql)
+
+
+def to_sqlite(sql: str) -> str:
+    """Translate the MySQL dialect used by Database and setup_database to SQLite"""
+    sql, literals = _mask_literals(sql.strip().rstrip(";"))
+    sql = re.sub(r"^\s*INSERT\s+IGNORE\s+INTO\b", "INSERT OR IGNORE INTO", sql, flags=re.I)
+    upsert = re.search(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", sql, flags=re.I)
+    if upsert:
+        updates = sql[upsert.end():]
+        if all(re.fullmatch(r"\s*(\w+)\s*=\s*\1\s*", update) for update in updates.split(",")):
+            # "col = col" changes nothing, which MySQL reports as 0 affected rows
+            sql = sql[:upsert.start()] + "ON CONFLICT DO NOTHING"
+        else:
+            updates = re.sub(r"\bVALUES\s*\(\s*(\w+)\s*\)", r"excluded.\1", updates, flags=re.I)
+            sql = sql[:upsert.start()] + "ON CONFLICT DO UPDATE SET" + updates
+    sql = re.sub(r"\bNOW\(\)", "CURRENT_TIMESTAMP", sql, flags=re.I)
+    if re.match(r"\s*CREATE\s+TABLE\b", sql, flags=re.I):
+        sql = sql[:sql.rindex(")") + 1]                                   # ENGINE=..., CHARSET=...
+        sql = re.sub(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", "INTEGER PRIMARY KEY AUTOINCREMENT", sql, flags=re.I)
+        sql = re.sub(r",\s*(?:INDEX|KEY)\s+\w+\s*\([^)]*\)", "", sql, flags=re.I)
+        sql = re.sub(r"\bUNIQUE\s+(?:KEY|INDEX)\s+\w+\s*\(", "UNIQUE (", sql, flags=re.I)
+        sql = re.sub(r"\bON\s+UPDATE\s+CURRENT_TIMESTAMP\b", "", sql, flags=re.I)
+    return _unmask_literals(sql, literals)
+
+
+class _Session(socketserver.BaseRequestHandler):
+    """One client connection: its own SQLite connection, transaction state and prepared statements"""
+
+    def setup(self):
+        self.seq = 0
+        self.autocommit = True
+        self.explicit_transaction = False
+        self.statements = {}
+        self.next_statement_id = 1
+        self.db = sqlite3.connect(self.server.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA foreign_keys = ON")
+
+    def finish(self):
+        self.db.close()
+
+    # ---------- packets ----------
+
+    def _recv_exact(self, n: int) -> bytes:
+        data = b""
+        while len(data) < n:
+            chunk = self.request.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError("client closed the connection")
+            data += chunk
+        return data
+
+    def read_packet(self) -> bytes:
+        payload = b""
+        while True:
+            header = self._recv_exact(4)
+            length = int.from_bytes(header[:3], "little")
+            self.seq = (header[3] + 1) % 256
+            payload += self._recv_exact(length)
+            if length < MAX_PACKET:
+                return payload
+
+    def send(self, payload: bytes):
+        while True:
+            chunk, payload = payload[:MAX_PACKET], payload[MAX_PACKET:]
+            self.request.sendall(len(chunk).to_bytes(3, "little") + bytes([self.seq]) + chunk)
+            self.seq = (self.seq + 1) % 256
+            if len(chunk) < MAX_PACKET:
+                return
+
+    @property
+    def status(self) -> int:
+        return (STATUS_AUTOCOMMIT if self.autocommit else 0) | (STATUS_IN_TRANS if self.db.in_transaction else 0)
+
+    def send_ok(self, affected_rows: int = 0, last_insert_id: int = 0):
+        self.send(b"\x00" + _lenenc_int(max(affected_rows, 0)) + _lenenc_int(last_insert_id or 0)
+                  + struct.pack("<HH", self.status, 0))
+
+    def send_eof(self):
+        self.send(b"\xfe" + struct.pack("<HH", 0, self.status))
+
+    def send_error(self, code: int, sqlstate: str, message: str):
+        self.send(b"\xff" + struct.pack("<H", code) + b"#" + sqlstate.encode() + message.encode("utf-8"))
+
+    def send_column(self, name: str, column_type: int):
+        charset = 33 if column_type == TYPE_VAR_STRING else 63
+        self.send(_lenenc_str("def") + _lenenc_str(self.server.database) + _lenenc_str("")
+                  + _lenenc_str("") + _lenenc_str(name) + _lenenc_str(name) + b"\x0c"
+                  + struct.pack("<HIBHB", charset, 255, column_type, 0, 0) + b"\x00\x00")
+
+    # ---------- connection phase ----------
+
+    def handle(self):
+        self.server.connection_opened()
+        try:
+            salt = "".join(random.choices(string.ascii_letters + string.digits, k=20)).encode()
+            self.send(b"\x0a" + SERVER_VERSION.encode() + b"\x00" + struct.pack("<I", self.server.next_connection_id())
+                      + salt[:8] + b"\x00" + struct.pack("<H", SERVER_CAPABILITIES & 0xffff) + bytes([45])
+                      + struct.pack("<HH", STATUS_AUTOCOMMIT, SERVER_CAPABILITIES >> 16) + bytes([21])
+                      + b"\x00" * 10 + salt[8:] + b"\x00" + b"mysql_native_password\x00")
+            self.read_packet()                  # any user / password is accepted
+            self.send_ok()
+            while True:
+                self.seq = 0
+                packet = self.read_packet()
+                if self.server.latency:
+                    time.sleep(self.server.latency)
+                if not self.dispatch(packet[0], packet[1:]):
+                    return
+        except (ConnectionError, OSError):
+            return
+        finally:
+            self.server.connection_closed()
+
+    def dispatch(self, command: int, body: bytes) -> bool:
+        if command == COM_QUIT:
+            return False
+        if command == COM_QUERY:
+            self.server.count("queries")
+            self.run(body.decode("utf-8"), (), binary=False)
+        elif command == COM_STMT_PREPARE:
+            self.prepare(body.decode("utf-8"))
+        elif command == COM_STMT_EXECUTE:
+            self.execute_statement(body)
+        elif command == COM_STMT_CLOSE:
+            self.statements.pop(struct.unpack_from("<I", body)[0], None)
+        elif command == COM_STMT_RESET:
+            self.send_ok()
+        elif command == COM_RESET_CONNECTION:
+            self.reset()
+            self.send_ok()
+        elif command in (COM_PING, COM_INIT_DB, COM_CHANGE_USER):
+            self.send_ok()
+        else:
+            self.send_error(1047, "08S01", f"Unknown command {command}")
+        return True
+
+    def reset(self):
+        if self.db.in_transaction:
+            self.db.execute("ROLLBACK")
+        self.statements.clear()
+        self.autocommit = True
+        self.explicit_transaction = False
+
+    # ---------- statements ----------
+
+    def run(self, sql: str, params, binary: bool):
+        keyword = (sql.lstrip().split(None, 1) or [""])[0].upper()
+        try:
+            if keyword in ("START", "BEGIN"):
+                if not self.db.in_transaction:
+                    self.db.execute("BEGIN IMMEDIATE")
+                self.explicit_transaction = True
+                return self.send_ok()
+            if keyword in ("COMMIT", "ROLLBACK"):
+                if self.db.in_transaction:
+                    self.db.execute(keyword)
+                self.explicit_transaction = False
+                return self.send_ok()
+            if keyword == "SET":
+                setting = re.search(r"autocommit\s*=\s*(\w+)", sql, flags=re.I)
+                if setting:
+                    self.autocommit = setting.group(1).upper() in ("1", "ON", "TRUE")
+                    if self.autocommit and self.db.in_transaction:
+                        self.db.execute("COMMIT")
+                return self.send_ok()
+            if keyword in ("USE", "DROP", "GRANT", "FLUSH") or re.match(r"\s*CREATE\s+(?:DATABASE|USER)\b", sql, re.I):
+                return self.send_ok()
+            if keyword == "SELECT" and "@@" in sql:
+                return self.send_variables(sql, binary)
+
+            if not self.db.in_transaction and (not self.autocommit or keyword != "SELECT"):
+                self.db.execute("BEGIN IMMEDIATE" if keyword != "SELECT" else "BEGIN")
+            cursor = self.db.execute(to_sqlite(sql), params)
+            if cursor.description:
+                self.send_rows([column[0] for column in cursor.description], cursor.fetchall(), binary)
+            else:
+                self.send_ok(cursor.rowcount, cursor.lastrowid)
+            if self.autocommit and not self.explicit_transaction and self.db.in_transaction:
+                self.db.execute("COMMIT")
+        except sqlite3.Error as e:
+            message = str(e)
+            code, sqlstate = next(((code, state) for text, code, state in SQLITE_ERRORS if text in message),
+                                  (1064, "42000"))
+            self.server.count("errors")
+            self.send_error(code, sqlstate, message)
+
+    def send_variables(self, sql: str, binary: bool):
+        values = {"version": SERVER_VERSION, "autocommit": int(self.autocommit),
+                  "transaction_isolation": "REPEATABLE-READ", "sql_mode": "", "time_zone": "SYSTEM"}
+        names = re.findall(r"@@(?:session\.|global\.)?(\w+)", sql)
+        self.send_rows([f"@@{name}" for name in names], [tuple(values.get(name) for name in names)], binary)
+
+    @staticmethod
+    def _column_type(values) -> int:
+        values = [value for value in values if value is not None]
+        if values and all(isinstance(value, int) for value in values):
+            return TYPE_LONGLONG
+        if values and all(isinstance(value, (int, float)) for value in values):
+            return TYPE_DOUBLE
+        return TYPE_VAR_STRING
+
+    def send_rows(self, names, rows, binary: bool):
+        types = [self._column_type([row[i] for row in rows]) for i in range(len(names))]
+        self.send(_lenenc_int(len(names)))
+        for name, column_type in zip(names, types):
+            self.send_column(name, column_type)
+        self.send_eof()
+        for row in rows:
+            if binary:
+                null_bitmap = bytearray((len(names) + 9) // 8)
+                values = b""
+                for i, (value, column_type) in enumerate(zip(row, types)):
+                    if value is None:
+                        null_bitmap[(i + 2) // 8] |= 1 << ((i + 2) % 8)
+                    elif column_type == TYPE_LONGLONG:
+                        values += struct.pack("<q", value)
+                    elif column_type == TYPE_DOUBLE:
+                        values += struct.pack("<d", value)
+                    else:
+                        values += _lenenc_str(value)
+                self.send(b"\x00" + bytes(null_bitmap) + values)
+            else:
+                self.send(b"".join(b"\xfb" if value is None else _lenenc_str(value) for value in row))
+        self.send_eof()
+
+    def prepare(self, sql: str):
+        self.server.count("prepares")
+        masked, _ = _mask_literals(sql)
+        n_params = masked.count("?")
+        statement_id = self.next_statement_id
+        self.next_statement_id += 1
+        self.statements[statement_id] = {"sql": sql, "n_params": n_params, "types": None}
+        self.send(b"\x00" + struct.pack("<IHHBH", statement_id, 0, n_params, 0, 0))
+        if n_params:
+            for _ in range(n_params):
+                self.send_column("?", TYPE_VAR_STRING)
+            self.send_eof()
+
+    def execute_statement(self, body: bytes):
+        self.server.count("executes")
+        statement_id = struct.unpack_from("<I", body)[0]
+        statement = self.statements.get(statement_id)
+        if statement is None:
+            return self.send_error(1243, "HY000", f"Unknown prepared statement handler ({statement_id})")
+        n_params = statement["n_params"]
+        params = []
+        if n_params:
+            pos = 9
+            null_bitmap = body[pos:pos + (n_params + 7) // 8]
+            pos += len(null_bitmap)
+            if body[pos] == 1:
+                statement["types"] = [struct.unpack_from("<BB", body, pos + 1 + 2 * i) for i in range(n_params)]
+                pos += 1 + 2 * n_params
+            else:
+                pos += 1
+            for i, (column_type, flags) in enumerate(statement["types"]):
+                if null_bitmap[i // 8] & (1 << (i % 8)) or column_type == TYPE_NULL:
+                    params.append(None)
+                    continue
+                value, pos = self._read_param(body, pos, column_type, flags & 0x80)
+                params.append(value)
+        self.run(statement["sql"], params, binary=True)
+
+    @staticmethod
+    def _read_param(body: bytes, pos: int, column_type: int, unsigned: bool):
+        integer_formats = {TYPE_TINY: "b", TYPE_SHORT: "h", TYPE_YEAR: "h", TYPE_LONG: "i",
+                           TYPE_INT24: "i", TYPE_LONGLONG: "q"}
+        if column_type in integer_formats:
+            fmt = integer_formats[column_type]
+            fmt = fmt.upper() if unsigned else fmt
+            return struct.unpack_from("<" + fmt, body, pos)[0], pos + struct.calcsize(fmt)
+        if column_type == TYPE_FLOAT:
+            return struct.unpack_from("<f", body, pos)[0], pos + 4
+        if column_type == TYPE_DOUBLE:
+            return struct.unpack_from("<d", body, pos)[0], pos + 8
+        if column_type in (TYPE_DATE, TYPE_DATETIME, TYPE_TIMESTAMP):
+            length = body[pos]
+            parts = struct.unpack_from("<HBBBBB", body + b"\x00" * 7, pos + 1)
+            micro = struct.unpack_from("<I", body, pos + 8)[0] if length == 11 else 0
+            value = "%04d-%02d-%02d" % parts[:3]
+            if column_type != TYPE_DATE:
+                value += " %02d:%02d:%02d" % parts[3:] + (f".{micro:06d}" if micro else "")
+            return value, pos + 1 + length
+        if column_type == TYPE_TIME:
+            length = body[pos]
+            negative, days, hours, minutes, seconds = struct.unpack_from("<BIBBB", body + b"\x00" * 12, pos + 1)
+            total = days * 24 + hours
+            return f"{'-' if negative else ''}{total:02d}:{minutes:02d}:{seconds:02d}", pos + 1 + length
+        length, pos = _read_lenenc_int(body, pos)
+        raw = body[pos:pos + length]
+        try:
+            return raw.decode("utf-8"), pos + length
+        except UnicodeDecodeError:
+            return raw, pos + length
+
+
+class MySQLStandIn(socketserver.ThreadingTCPServer):
+    """Threaded MySQL protocol server over one SQLite file (WAL, foreign keys on)"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port: int = 0, path: str = None, database: str = "financial_news", latency: float = 0.0):
+        super().__init__(("127.0.0.1", port), _Session)
+        self._tmp_dir = None if path else tempfile.mkdtemp(prefix="mysql_standin_")
+        self.path = path or os.path.join(self._tmp_dir, "standin.db")
+        self.database = database
+        self.latency = latency
+        self.stats = {"connections": 0, "open_connections": 0, "queries": 0,
+                      "prepares": 0, "executes": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._connection_id = 0
+        with sqlite3.connect(self.path) as db:
+            db.execute("PRAGMA journal_mode = WAL")
+
+    @property
+    def host(self) -> str:
+        return self.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def next_connection_id(self) -> int:
+        with self._lock:
+            self._connection_id += 1
+            return self._connection_id
+
+    def connection_opened(self):
+        with self._lock:
+            self.stats["connections"] += 1
+            self.stats["open_connections"] += 1
+
+    def connection_closed(self):
+        self.count("open_connections", -1)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._tmp_dir:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
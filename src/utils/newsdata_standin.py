@@ -0,0 +1,224 @@
+"""
+Local stand-in for the NewsData.io /latest endpoint and article pages.
+NewsDataStandIn serves synthetic articles per query with nextPage pagination,
+and enforces its own rate limit (429 + Retry-After) and credit budget, so the
+fetch scheduler can be exercised without the real API. ReplayStandIn serves a
+recorded NewsArchive instead. Both can add latency and inject 500 errors.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_html(self, status: int, html: str):
+        body = html.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        if server.latency or server.jitter:
+            time.sleep(server.latency + random.uniform(0, server.jitter))
+        if server.should_fail(self.path):
+            self._send_json(500, {'status': 'error', 'results': {'message': 'injected error'}})
+            return
+
+        if parsed.path.rstrip('/') == '/html' or parsed.path.startswith('/articles/'):
+            url = params.get('url') or f"http://127.0.0.1:{server.server_address[1]}{parsed.path}"
+            html = server.html(url)
+            if html is None:
+                self._send_html(404, '<html><body>not found</body></html>')
+            else:
+                self._send_html(200, html)
+            return
+        if not parsed.path.rstrip('/').endswith('/latest'):
+            self._send_json(404, {'status': 'error', 'results': {'message': 'not found'}})
+            return
+
+        allowed, retry_after = server.admit()
+        if not allowed:
+            self._send_json(429, {'status': 'error', 'results': {
+                'message': 'Rate limit exceeded', 'code': 'RateLimitExceeded'}},
+                headers={'Retry-After': f"{retry_after:.2f}"})
+            return
+        page = server.page(params)
+        if page is None:
+            self._send_json(404, {'status': 'error', 'results': {'message': 'request not recorded'}})
+            return
+        self._send_json(200, page)
+
+
+class NewsDataStandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, articles_per_query: int = 50, rate_limit: float = 20.0,
+                 burst: int = 10, credits: int = 1000, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: int = None):
+        super().__init__(('127.0.0.1', port), _StandInHandler)
+        self.articles_per_query = articles_per_query
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.credits = credits
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.errors_injected = 0
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._attempts = {}
+        self.requests_served = 0
+        self.rate_limited = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api/1"
+
+    def admit(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_limit)
+            self._updated = now
+            if self._tokens < 1 or self.credits <= 0:
+                self.rate_limited += 1
+                return False, (1 - self._tokens) / self.rate_limit if self.credits > 0 else 60.0
+            self._tokens -= 1
+            self.credits -= 1
+            self.requests_served += 1
+            return True, 0.0
+
+    def should_fail(self, request: str = '') -> bool:
+        """Inject an error into this request with probability error_rate
+
+        With a seed the draw depends only on the request and how often it has
+        been sent, so the same requests fail in every run whatever order
+        concurrent clients send them in.
+        """
+        with self._lock:
+            if not self.error_rate:
+                return False
+            attempt = self._attempts[request] = self._attempts.get(request, 0) + 1
+            if self.seed is None:
+                draw = self._random.random()
+            else:
+                draw = random.Random(f"{self.seed}:{request}:{attempt}").random()
+            if draw < self.error_rate:
+                self.errors_injected += 1
+                return True
+            return False
+
+    def html_url(self, url: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/html?url={quote(url, safe='')}"
+
+    def html(self, url: str):
+        title = url.rsplit('/', 1)[-1]
+        return (f"<html><head><title>{title}</title></head><body><article>"
+                f"<h1>{title}</h1><p>Synthetic article body for {url}.</p></article></body></html>")
+
+    def _article(self, query: str, idx: int) -> dict:
+        # a few articles are shared between queries so cross-query dedup is exercised
+        key = f"shared-{idx}" if idx % 10 == 0 else f"{query}-{idx}"
+        article_id = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return {
+            'article_id': article_id,
+            'title': f"{query} article {idx}",
+            'link': f"http://127.0.0.1:{self.server_address[1]}/articles/{article_id}",
+            'description': f"Synthetic description for {query} #{idx}",
+            'source_name': 'Stand-in Wire',
+            'pubDate': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(1_700_000_000 + idx * 60)),
+            'category': ['business'],
+            'image_url': None,
+        }
+
+    def page(self, params: dict) -> dict:
+        query = params.get('q', '')
+        size = min(int(params.get('size', 10)), 50)
+        offset = int(params.get('page') or 0)
+        end = min(offset + size, self.articles_per_query)
+        results = [self._article(query, idx) for idx in range(offset, end)]
+        return {
+            'status': 'success',
+            'totalResults': self.articles_per_query,
+            'results': results,
+            'nextPage': str(end) if end < self.articles_per_query else None,
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class ReplayStandIn(NewsDataStandIn):
+    """Serves API responses and article HTML recorded in a NewsArchive"""
+
+    def __init__(self, archive, port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: float = 1000.0, burst: int = 100, seed: int = None):
+        super().__init__(port=port, rate_limit=rate_limit, burst=burst, credits=10 ** 9,
+                         latency=latency, jitter=jitter, error_rate=error_rate, seed=seed)
+        self.archive = archive
+
+    def page(self, params: dict):
+        return self.archive.get_response(params)
+
+    def html(self, url: str):
+        return self.archive.get_html(url)
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+    from pathlib import Path
+
+    sys.path.append(str(Path(__file__).parent.parent))
+    from components.news_archive import NewsArchive
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--archive', help='serve a recorded NewsArchive instead of synthetic articles')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=None, help='make error injection reproducible')
+    args = parser.parse_args()
+
+    if args.archive:
+        server = ReplayStandIn(NewsArchive(args.archive, mode="replay"), port=args.port,
+                               latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                               seed=args.seed)
+    else:
+        server = NewsDataStandIn(port=args.port, latency=args.latency, jitter=args.jitter,
+                                 error_rate=args.error_rate, seed=args.seed)
+    print(f"NewsData stand-in listening on {server.base_url}")
+    server.serve_forever()
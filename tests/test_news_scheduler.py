@@ -0,0 +1,109 @@
+import sys
+import time
+import unittest
+from email.utils import formatdate
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from config_entity import DataIngestionConfig
+from components.news_scheduler import NewsFetchScheduler
+from utils.newsdata_standin import NewsDataStandIn
+
+
+def make_config(server, **overrides):
+    settings = dict(root_dir='.', base_url=server.base_url, requests_per_second=100.0, burst=10)
+    settings.update(overrides)
+    return DataIngestionConfig(**settings)
+
+
+def fake_response(status, headers=None, payload=None):
+    response = mock.Mock(status_code=status, headers=headers or {}, text='')
+    response.json.return_value = payload
+    return response
+
+
+class NewsFetchSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        # 25 articles per query: pages of 10, 10 and 5, and every tenth article is shared between queries
+        self.server = NewsDataStandIn(articles_per_query=25, rate_limit=1000.0, burst=100).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_follows_next_page_until_results_run_out(self):
+        scheduler = NewsFetchScheduler(make_config(self.server))
+        articles = scheduler.fetch(['HDFC'], limit=100)
+        self.assertEqual([a['title'] for a in articles], [f"HDFC article {idx}" for idx in range(25)])
+        self.assertEqual(scheduler.stats['requests'], 3)
+        self.assertEqual(self.server.requests_served, 3)
+
+    def test_stops_at_limit(self):
+        scheduler = NewsFetchScheduler(make_config(self.server))
+        articles = scheduler.fetch(['HDFC'], limit=15)
+        self.assertEqual(len(articles), 15)
+        self.assertEqual(scheduler.stats['requests'], 2)
+
+    def test_dedups_across_queries_and_tags_the_query_that_found_each_article(self):
+        scheduler = NewsFetchScheduler(make_config(self.server))
+        articles = scheduler.fetch(['HDFC', 'SBI'], limit=100)
+        ids = [a['article_id'] for a in articles]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(len(articles), 47)
+        self.assertEqual(scheduler.stats['duplicates'], 3)
+        for article in articles:
+            with self.subTest(title=article['title']):
+                # shared articles keep the first query in the order given
+                self.assertEqual(article['search_query'], article['title'].split(' article ')[0])
+        self.assertEqual(sum(a['search_query'] == 'SBI' for a in articles), 22)
+
+    def test_rate_limited_requests_are_retried(self):
+        server = NewsDataStandIn(articles_per_query=25, rate_limit=10.0, burst=2).start()
+        try:
+            scheduler = NewsFetchScheduler(make_config(server, max_retries=10))
+            articles = scheduler.fetch(['HDFC', 'SBI'], limit=100)
+        finally:
+            server.stop()
+        self.assertGreater(scheduler.stats['rate_limited'], 0)
+        self.assertEqual(len(articles), 47)
+
+
+class RetryAfterTest(unittest.TestCase):
+
+    def test_delay_seconds(self):
+        self.assertEqual(NewsFetchScheduler._retry_after('2', attempt=0), 2.0)
+        self.assertEqual(NewsFetchScheduler._retry_after('0.25', attempt=3), 0.25)
+
+    def test_http_date(self):
+        delay = NewsFetchScheduler._retry_after(formatdate(time.time() + 30, usegmt=True), attempt=0)
+        self.assertTrue(28 <= delay <= 30, delay)
+        past = formatdate(time.time() - 30, usegmt=True)
+        self.assertEqual(NewsFetchScheduler._retry_after(past, attempt=0), 0.0)
+
+    def test_missing_or_unparseable_header_backs_off_exponentially(self):
+        self.assertEqual(NewsFetchScheduler._retry_after(None, attempt=2), 4.0)
+        self.assertEqual(NewsFetchScheduler._retry_after('soon', attempt=3), 8.0)
+
+    def backoff_after_429(self, retry_after):
+        config = DataIngestionConfig(root_dir='.', base_url='http://127.0.0.1:9', requests_per_second=100.0)
+        scheduler = NewsFetchScheduler(config)
+        payload = {'status': 'success', 'results': [], 'nextPage': None}
+        scheduler.session.get = mock.Mock(side_effect=[
+            fake_response(429, {'Retry-After': retry_after}), fake_response(200, payload=payload)])
+        start = time.monotonic()
+        self.assertEqual(scheduler._request_page({'q': 'HDFC'}), payload)
+        self.assertEqual(scheduler.stats['rate_limited'], 1)
+        return time.monotonic() - start
+
+    def test_429_with_delay_seconds_waits_before_retrying(self):
+        self.assertGreaterEqual(self.backoff_after_429('0.5'), 0.5)
+
+    def test_429_with_http_date_waits_before_retrying(self):
+        # HTTP-dates have one second resolution, so two seconds ahead is at least one second away
+        self.assertGreaterEqual(self.backoff_after_429(formatdate(time.time() + 2, usegmt=True)), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from components.sentiment_index import SentimentIndexEngine
+from components.sentiment_results import SentimentResults
+
+LABELS = ("positive", "negative", "neutral")
+
+
+def make_articles(ids):
+    return [{'article_id': article_id, 'pubDate': f"2025-03-0{i + 1} 10:00:00"} for i, article_id in enumerate(ids)]
+
+
+def make_results(scores):
+    """scores: {article_id: (positive, negative, neutral)}"""
+    return SentimentResults(list(scores), np.array(list(scores.values())), LABELS)
+
+
+class BuildObservationsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tags = [
+            {'article_id': 'a1', 'symbol': 'INFY', 'mention_count': 1},
+            {'article_id': 'a2', 'symbol': 'TCS', 'mention_count': 2},
+            {'article_id': 'a3', 'symbol': 'SBIN', 'mention_count': 1},
+        ]
+
+    def net_by_symbol(self, observations):
+        return dict(zip(observations['symbol'], observations['net'].round(6)))
+
+    def test_results_in_a_different_order_are_matched_by_article_id(self):
+        articles = make_articles(['a1', 'a2', 'a3'])
+        results = make_results({'a3': (0.1, 0.8, 0.1), 'a1': (0.9, 0.05, 0.05), 'a2': (0.2, 0.2, 0.6)})
+        observations = SentimentIndexEngine.build_observations(articles, results, self.tags)
+        self.assertEqual(self.net_by_symbol(observations), {'INFY': 0.85, 'TCS': 0.0, 'SBIN': -0.7})
+
+    def test_partly_overlapping_sets_keep_only_scored_articles(self):
+        articles = make_articles(['a1', 'a2', 'a3'])
+        # a2 was not scored, a9 is not in this article batch
+        results = make_results({'a9': (0.9, 0.05, 0.05), 'a3': (0.1, 0.8, 0.1), 'a1': (0.6, 0.3, 0.1)})
+        observations = SentimentIndexEngine.build_observations(articles, results, self.tags)
+        self.assertEqual(self.net_by_symbol(observations), {'INFY': 0.3, 'SBIN': -0.7})
+
+    def test_more_results_than_articles(self):
+        articles = make_articles(['a2'])
+        results = make_results({'a1': (0.9, 0.05, 0.05), 'a2': (0.1, 0.7, 0.2), 'a3': (0.3, 0.3, 0.4)})
+        observations = SentimentIndexEngine.build_observations(articles, results, self.tags)
+        self.assertEqual(self.net_by_symbol(observations), {'TCS': -0.6})
+        self.assertAlmostEqual(observations['weight'].iloc[0], 1.4, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from components.text_cleaning import TextCleaner
+
+# real article paragraphs that look like boilerplate at the start of the line
+CONTENT = [
+    "By December, Infosys will hire 20,000 freshers.",
+    "By March 2026, the bank expects its loan book to cross Rs 5 lakh crore.",
+    "Source: RBI data shows CPI at 5.1%.",
+    "Updated on March 3, Sensex fell 900 points in early trade.",
+    "Updated guidance from the company puts FY26 revenue growth at 8-10%.",
+    "Top news today is the RBI rate cut of 25 bps",
+    "Register of members shows 5% stake change",
+    "Registered investors can bid for the IPO until Friday.",
+    "Subscribers to the rights issue will get one share for every five held.",
+    "Published data on Friday showed exports rose 4% in February.",
+    "Read more closely, the filing shows promoters pledged 12% of their holding.",
+    "Photographs released by ISRO show the lander on the lunar surface.",
+    "Also, the board approved a dividend of Rs 10 per share.",
+    "Related party transactions rose to Rs 2,300 crore during the year.",
+]
+
+BOILERPLATE = [
+    "By Reuters",
+    "By Priya Sharma, ET Bureau",
+    "By Rahul Mehta and Anita Rao | Mumbai",
+    "Updated: 10 Mar 2025, 09:45 AM IST",
+    "Last Updated: March 3, 2025 | 14:02 IST",
+    "First published on Monday, 3 March 2025",
+    "Image source: Reuters",
+    "Photo: PTI",
+    "Also read: Nifty ends flat as IT stocks drag",
+    "Advertisement",
+    "Story continues below this ad",
+    "Subscribe to our newsletter",
+    "Top News",
+    "Download the Mint app",
+    "(With inputs from PTI)",
+    "Disclaimer: The views expressed are those of the analyst.",
+]
+
+
+class TextCleanerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cleaner = TextCleaner()
+
+    def test_keeps_article_content(self):
+        for line in CONTENT:
+            with self.subTest(line=line):
+                self.assertEqual(self.cleaner.clean(line), line)
+
+    def test_drops_boilerplate_lines(self):
+        for line in BOILERPLATE:
+            with self.subTest(line=line):
+                self.assertEqual(self.cleaner.clean(line), '')
+
+    def test_article_keeps_every_content_paragraph(self):
+        text = "\n".join(["By Priya Sharma, ET Bureau", CONTENT[0], "Advertisement", CONTENT[3],
+                          "Also read: Nifty ends flat", CONTENT[1], CONTENT[0]])
+        self.assertEqual(self.cleaner.clean(text), "\n".join([CONTENT[0], CONTENT[3], CONTENT[1]]))
+
+    def test_strips_inline_image_credit(self):
+        self.assertEqual(
+            self.cleaner.clean("Shares of Tata Motors jumped 6% (Image source: Reuters) on Tuesday."),
+            "Shares of Tata Motors jumped 6% on Tuesday."
+        )
+
+    def test_collapses_non_breaking_and_zero_width_spaces(self):
+        self.assertEqual(self.cleaner.clean("Sensex\u00a0fell \u200b900\tpoints"), "Sensex fell 900 points")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from config_entity import TickerTaggingConfig
+from components.ticker_tagging import TickerTagger
+
+DICTIONARY = Path(__file__).parent.parent / 'data' / 'tickers.csv'
+
+
+class TickerTaggerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tagger = TickerTagger(TickerTaggingConfig(root_dir='.', dictionary_path=DICTIONARY))
+
+    def matches(self, text):
+        return [(text[start:end], symbol) for start, end, symbol in self.tagger.find(text)]
+
+    def test_offsets_survive_characters_that_lengthen_when_lowered(self):
+        self.assertEqual(self.matches("İİ HDFC Bank rally"), [("HDFC Bank", "HDFCBANK")])
+        self.assertEqual(self.matches("İstanbul desk: Infosys and TCS gain"),
+                         [("Infosys", "INFY"), ("TCS", "TCS")])
+
+    def test_group_companies_win_over_the_parent_alias(self):
+        self.assertEqual(self.matches("HDFC Life and SBI Card rose, HDFC fell"),
+                         [("HDFC Life", "HDFCLIFE"), ("SBI Card", "SBICARD"), ("HDFC", "HDFCBANK")])
+
+
+if __name__ == '__main__':
+    unittest.main()